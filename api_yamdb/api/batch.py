@@ -0,0 +1,138 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.http import HttpRequest, QueryDict
+from django.urls import Resolver404, resolve
+
+API_PREFIX = "/api/v1/"
+# Headers of the batch request that do not apply to its operations.
+SKIPPED_META = (
+    "CONTENT_LENGTH",
+    "CONTENT_TYPE",
+    "HTTP_IF_MATCH",
+    "HTTP_IF_MODIFIED_SINCE",
+    "HTTP_IF_NONE_MATCH",
+    "HTTP_IF_UNMODIFIED_SINCE",
+)
+FAILED_DEPENDENCY = 424
+
+executor = ThreadPoolExecutor(
+    max_workers=getattr(settings, "BATCH_WORKERS", 4),
+    thread_name_prefix="batch",
+)
+
+
+class Batch:
+    """Run batch operations through the views of a router.
+
+    Operations reuse the user and token of the batch request instead of
+    authenticating again. Everything runs in order in the request thread,
+    except that `execute(parallel=True)` sends runs of consecutive GETs to a
+    shared thread pool.
+    """
+
+    def __init__(self, request, views):
+        self.request = request
+        self.views = views
+        self.in_transaction = False
+
+    def build_request(self, method, path, query, body):
+        outer = self.request._request
+        request = HttpRequest()
+        request.method = method
+        request.path = request.path_info = path
+        request.META = {
+            key: value
+            for key, value in outer.META.items()
+            if key not in SKIPPED_META
+        }
+        request.META.update(
+            REQUEST_METHOD=method, PATH_INFO=path, QUERY_STRING=query
+        )
+        request.GET = QueryDict(query)
+        request.COOKIES = outer.COOKIES
+        if body is not None:
+            data = json.dumps(body).encode()
+            request.META["CONTENT_TYPE"] = "application/json"
+            request.META["CONTENT_LENGTH"] = str(len(data))
+            request._stream = BytesIO(data)
+            request._read_started = False
+        request.in_batch_transaction = self.in_transaction
+        if self.request.user.is_authenticated:
+            request._force_auth_user = self.request.user
+            request._force_auth_token = self.request.auth
+        return request
+
+    def run(self, operation):
+        url = operation["url"]
+        if not url.startswith("/"):
+            url = API_PREFIX + url
+        parts = urlsplit(url)
+        try:
+            match = resolve(parts.path)
+        except Resolver404:
+            match = None
+        if match is None or match.func not in self.views:
+            return {"status": 404, "body": {"detail": "Not found."}}
+        request = self.build_request(
+            operation["method"], parts.path, parts.query,
+            operation.get("body"),
+        )
+        request.resolver_match = match
+        response = match.func(request, *match.args, **match.kwargs)
+        return {
+            "status": response.status_code,
+            "body": getattr(response, "data", None),
+        }
+
+    def run_in_thread(self, operation):
+        close_old_connections()
+        try:
+            return self.run(operation)
+        finally:
+            close_old_connections()
+
+    def execute(self, operations, parallel=False):
+        results = []
+        start = 0
+        while start < len(operations):
+            end = start + 1
+            while (
+                parallel
+                and operations[start]["method"] == "GET"
+                and end < len(operations)
+                and operations[end]["method"] == "GET"
+            ):
+                end += 1
+            if end - start == 1:
+                results.append(self.run(operations[start]))
+            else:
+                results.extend(
+                    executor.map(self.run_in_thread, operations[start:end])
+                )
+            start = end
+        return results
+
+    def execute_atomic(self, operations):
+        """Run all operations in one transaction, stopping at a failure.
+
+        Reads see the writes made before them, so nothing runs in parallel.
+        Returns the results and whether the transaction was committed.
+        """
+        results = []
+        self.in_transaction = True
+        with transaction.atomic():
+            for operation in operations:
+                if results and results[-1]["status"] >= 400:
+                    results.append({"status": FAILED_DEPENDENCY, "body": None})
+                    continue
+                results.append(self.run(operation))
+            committed = all(result["status"] < 400 for result in results)
+            if not committed:
+                transaction.set_rollback(True)
+        self.in_transaction = False
+        return results, committed
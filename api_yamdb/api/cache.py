@@ -0,0 +1,85 @@
+import hashlib
+import threading
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.http import urlencode
+
+from core.metrics import CACHE_REQUESTS
+
+
+class ResponseCache:
+    """Cache of serialized API responses split into namespaces.
+
+    Every namespace has a version token stored in the cache itself, so
+    bumping it invalidates all of its responses in every process that
+    shares the cache backend.
+    """
+
+    def __init__(self, alias, timeout):
+        self.alias = alias
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def get_version(self, namespace):
+        key = f"api:{namespace}:version"
+        version = self.cache.get(key)
+        if version is None:
+            self.cache.add(key, uuid.uuid4().hex, None)
+            version = self.cache.get(key)
+        return version
+
+    def get_key(self, namespace, request):
+        user = request.user
+        if not user.is_authenticated:
+            role = "anonymous"
+        elif user.is_admin:
+            role = "admin"
+        else:
+            role = user.role
+        query = urlencode(sorted(request.GET.lists()), doseq=True)
+        digest = hashlib.md5(
+            f"{role}:{request.path}?{query}".encode()
+        ).hexdigest()
+        return f"api:{namespace}:{self.get_version(namespace)}:{digest}"
+
+    def get(self, namespace, key):
+        data = self.cache.get(key)
+        with self._lock:
+            if data is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        CACHE_REQUESTS.labels(
+            namespace, "miss" if data is None else "hit"
+        ).inc()
+        return data
+
+    def set(self, key, data):
+        self.cache.set(key, data, self.timeout)
+
+    def invalidate(self, *namespaces):
+        self.cache.set_many(
+            {
+                f"api:{namespace}:version": uuid.uuid4().hex
+                for namespace in namespaces
+            },
+            None,
+        )
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+
+response_cache = ResponseCache(
+    alias=getattr(settings, "API_CACHE_ALIAS", "default"),
+    timeout=getattr(settings, "API_CACHE_TIMEOUT", 300),
+)
@@ -1,16 +1,81 @@
-from django_filters.rest_framework import CharFilter, FilterSet, NumberFilter
+from django.db.models import Count
+from django_filters.rest_framework import (BaseCSVFilter, CharFilter,
+                                           FilterSet, NumberFilter)
+from rest_framework.filters import BaseFilterBackend
 
-from reviews.models import Title
+from reviews.models import Category, Genre, GenreTitle, Title
+
+
+class SlugsFilter(BaseCSVFilter, CharFilter):
+    """Comma-separated list of exact slugs."""
+
+
+def resolve_slugs(request, model, slugs):
+    """Map slugs to primary keys, querying once per request.
+
+    The filterset is rebuilt for every filter_queryset() call of a request
+    (conditional GET validators, page, facets), so the ids are kept on the
+    request.
+    """
+    cache = {} if request is None else request.__dict__.setdefault(
+        "resolved_slugs", {}
+    )
+    key = (model, frozenset(slugs))
+    if key not in cache:
+        cache[key] = list(
+            model.objects.filter(slug__in=key[1]).values_list("pk", flat=True)
+        )
+    return cache[key]
 
 
 class TitleFilter(FilterSet):
     name = CharFilter(field_name="name", lookup_expr="icontains")
-    genre = CharFilter(field_name="genre__slug", lookup_expr="icontains")
-    category = CharFilter(
+    genre = SlugsFilter(method="filter_genre")
+    genre__all = SlugsFilter(method="filter_genre")
+    genre__icontains = CharFilter(
+        field_name="genre__slug", lookup_expr="icontains"
+    )
+    category = SlugsFilter(method="filter_category")
+    category__icontains = CharFilter(
         field_name="category__slug", lookup_expr="icontains"
     )
     year = NumberFilter(field_name="year")
+    min_rating = NumberFilter(field_name="rating", lookup_expr="gte")
+    max_rating = NumberFilter(field_name="rating", lookup_expr="lte")
 
     class Meta:
         model = Title
-        fields = "__all__"
+        fields = ("name", "genre", "category", "year")
+
+    def filter_genre(self, queryset, name, value):
+        slugs = set(filter(None, value))
+        genre_ids = resolve_slugs(self.request, Genre, slugs)
+        match_all = name == "genre__all"
+        if not genre_ids or match_all and len(genre_ids) < len(slugs):
+            return queryset.none()
+        title_ids = GenreTitle.objects.filter(genre_id__in=genre_ids)
+        if match_all:
+            title_ids = (
+                title_ids.values("title_id")
+                .annotate(genres=Count("genre_id", distinct=True))
+                .filter(genres=len(genre_ids))
+            )
+        return queryset.filter(pk__in=title_ids.values("title_id"))
+
+    def filter_category(self, queryset, name, value):
+        category_ids = resolve_slugs(
+            self.request, Category, set(filter(None, value))
+        )
+        if not category_ids:
+            return queryset.none()
+        return queryset.filter(category_id__in=category_ids)
+
+
+class FullTextSearchFilter(BaseFilterBackend):
+    search_param = "search"
+
+    def filter_queryset(self, request, queryset, view):
+        text = request.query_params.get(self.search_param, "").strip()
+        if not text:
+            return queryset
+        return queryset.search(text)
@@ -0,0 +1,225 @@
+import json
+import random
+import statistics
+import time
+from collections import Counter
+from contextlib import nullcontext
+
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken
+
+from reviews.management.commands.generate_dataset import USERNAME_PREFIX
+from reviews.models import Comment, Review, Title
+from users.models import User
+
+SAMPLE_SIZE = 100
+
+
+class Command(BaseCommand):
+    help = (
+        "Replay API requests in-process through the test client and report "
+        "latency percentiles and queries per request."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=200,
+            help="Measured requests per scenario.",
+        )
+        parser.add_argument("--warmup", type=int, default=20)
+        parser.add_argument(
+            "--scenario",
+            action="append",
+            dest="scenarios",
+            help="Run only the named scenario; may be repeated.",
+        )
+        parser.add_argument(
+            "--authenticated",
+            action="store_true",
+            help="Send a JWT of a random user with read requests.",
+        )
+        parser.add_argument(
+            "--cold-cache",
+            action="store_true",
+            help="Clear the cache before every request.",
+        )
+        parser.add_argument(
+            "--full-middleware",
+            action="store_true",
+            help="Run SITE_MIDDLEWARE for API requests too, for comparison.",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--output", help="Write results to a JSON file.")
+
+    def handle(self, *args, **options):
+        if options["requests"] < 2:
+            raise CommandError("--requests must be at least 2.")
+        self.random = random.Random(options["seed"])
+        self.load_samples()
+        self.client = Client()
+        headers = {}
+        if options["authenticated"]:
+            username, _ = self.random.choice(self.users)
+            user = User.objects.get(username=username)
+            headers["HTTP_AUTHORIZATION"] = (
+                f"Bearer {AccessToken.for_user(user)}"
+            )
+
+        scenarios = self.get_scenarios()
+        names = options["scenarios"] or list(scenarios)
+        unknown = set(names) - set(scenarios)
+        if unknown:
+            raise CommandError(f"Unknown scenarios: {', '.join(unknown)}")
+
+        middleware = (
+            override_settings(LEAN_MIDDLEWARE_PATHS=())
+            if options["full_middleware"]
+            else nullcontext()
+        )
+        results = {}
+        with middleware:
+            for name in names:
+                results[name] = self.run_scenario(
+                    scenarios[name], headers, options
+                )
+                self.report(name, results[name])
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as file:
+                json.dump(
+                    {
+                        "created": timezone.now().isoformat(),
+                        "options": {
+                            key: options[key]
+                            for key in (
+                                "requests",
+                                "warmup",
+                                "authenticated",
+                                "cold_cache",
+                                "full_middleware",
+                                "seed",
+                            )
+                        },
+                        "dataset": self.dataset,
+                        "scenarios": results,
+                    },
+                    file,
+                    indent=2,
+                    sort_keys=True,
+                )
+
+    def sample(self, queryset):
+        population = list(queryset.order_by("pk"))
+        return self.random.sample(
+            population, min(SAMPLE_SIZE, len(population))
+        )
+
+    def load_samples(self):
+        self.titles = self.sample(Title.objects.values_list("pk", flat=True))
+        self.reviews = self.sample(
+            Review.objects.values_list("title_id", "pk")
+        )
+        self.users = self.sample(
+            User.objects.filter(username__startswith=USERNAME_PREFIX)
+            .values_list("username", "confirmation_code")
+        )
+        if not (self.titles and self.reviews and self.users):
+            raise CommandError(
+                "Not enough data, run generate_dataset first."
+            )
+        self.dataset = {
+            "titles": Title.objects.count(),
+            "reviews": Review.objects.count(),
+            "comments": Comment.objects.count(),
+            "users": User.objects.count(),
+        }
+
+    def get_scenarios(self):
+        return {
+            "title-list": self.title_list,
+            "title-facets": self.title_facets,
+            "title-detail": self.title_detail,
+            "review-list": self.review_list,
+            "comment-list": self.comment_list,
+            "auth-token": self.auth_token,
+        }
+
+    def title_list(self, headers):
+        page = self.random.randint(1, 5)
+        return self.client.get(f"/api/v1/titles/?page={page}", **headers)
+
+    def title_facets(self, headers):
+        page = self.random.randint(1, 5)
+        return self.client.get(
+            f"/api/v1/titles/?page={page}&facets=genre,category,year",
+            **headers,
+        )
+
+    def title_detail(self, headers):
+        title_id = self.random.choice(self.titles)
+        return self.client.get(f"/api/v1/titles/{title_id}/", **headers)
+
+    def review_list(self, headers):
+        title_id, _ = self.random.choice(self.reviews)
+        return self.client.get(
+            f"/api/v1/titles/{title_id}/reviews/", **headers
+        )
+
+    def comment_list(self, headers):
+        title_id, review_id = self.random.choice(self.reviews)
+        return self.client.get(
+            f"/api/v1/titles/{title_id}/reviews/{review_id}/comments/",
+            **headers,
+        )
+
+    def auth_token(self, headers):
+        username, confirmation_code = self.random.choice(self.users)
+        return self.client.post(
+            "/api/v1/auth/token/",
+            {"username": username, "confirmation_code": confirmation_code},
+        )
+
+    def run_scenario(self, scenario, headers, options):
+        for _ in range(options["warmup"]):
+            scenario(headers)
+
+        latencies = []
+        queries = []
+        statuses = Counter()
+        for _ in range(options["requests"]):
+            if options["cold_cache"]:
+                caches["default"].clear()
+            with CaptureQueriesContext(connection) as context:
+                started = time.perf_counter()
+                response = scenario(headers)
+                latencies.append((time.perf_counter() - started) * 1000)
+            queries.append(len(context.captured_queries))
+            statuses[str(response.status_code)] += 1
+
+        percentiles = statistics.quantiles(latencies, n=100)
+        return {
+            "requests": len(latencies),
+            "mean_ms": round(statistics.mean(latencies), 3),
+            "p50_ms": round(percentiles[49], 3),
+            "p95_ms": round(percentiles[94], 3),
+            "p99_ms": round(percentiles[98], 3),
+            "queries_per_request": round(statistics.mean(queries), 2),
+            "max_queries": max(queries),
+            "status_codes": dict(statuses),
+        }
+
+    def report(self, name, result):
+        self.stdout.write(
+            f"{name:<14} p50 {result['p50_ms']:8.2f} ms  "
+            f"p95 {result['p95_ms']:8.2f} ms  "
+            f"p99 {result['p99_ms']:8.2f} ms  "
+            f"queries {result['queries_per_request']:6.2f}  "
+            f"{result['status_codes']}"
+        )
@@ -0,0 +1,211 @@
+import json
+import random
+import statistics
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.test import Client
+from django.test.utils import override_settings
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken
+
+from reviews.management.commands.generate_dataset import USERNAME_PREFIX
+from reviews.models import Review
+from users.models import User
+
+SAMPLE_SIZE = 100
+
+
+class Command(BaseCommand):
+    help = (
+        "Replay a mix of API reads and comment writes from several threads "
+        "at once and report throughput, latency and failed requests."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument(
+            "--duration",
+            type=float,
+            default=5,
+            help="Seconds every thread keeps sending requests.",
+        )
+        parser.add_argument(
+            "--write-share",
+            type=float,
+            default=0.2,
+            help="Share of requests that post a comment.",
+        )
+        parser.add_argument(
+            "--no-tuning",
+            action="store_true",
+            help=(
+                "Use the rollback journal, Django's default pragmas and a "
+                "new connection per request, for comparison."
+            ),
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--output", help="Write results to a JSON file.")
+
+    def handle(self, *args, **options):
+        if options["threads"] < 1:
+            raise CommandError("--threads must be at least 1.")
+        if not 0 <= options["write_share"] <= 1:
+            raise CommandError("--write-share must be between 0 and 1.")
+        self.load_samples(random.Random(options["seed"]))
+
+        tuning = self.untuned() if options["no_tuning"] else self.tuned()
+        with tuning:
+            with connection.cursor() as cursor:
+                cursor.execute("PRAGMA journal_mode")
+                journal_mode = cursor.fetchone()[0]
+            samples = defaultdict(list)
+            threads = [
+                threading.Thread(
+                    target=self.worker,
+                    args=(index, samples, options),
+                )
+                for index in range(options["threads"])
+            ]
+            started = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - started
+
+        results = {
+            kind: self.summarize(kind_samples, elapsed)
+            for kind, kind_samples in sorted(samples.items())
+        }
+        self.stdout.write(
+            f"journal_mode={journal_mode} threads={options['threads']} "
+            f"elapsed {elapsed:.2f} s"
+        )
+        for kind, result in results.items():
+            self.stdout.write(
+                f"{kind:<6} {result['throughput_rps']:8.1f} req/s  "
+                f"p50 {result['p50_ms']:8.2f} ms  "
+                f"p99 {result['p99_ms']:8.2f} ms  "
+                f"failed {result['failed']}  {result['status_codes']}"
+            )
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as file:
+                json.dump(
+                    {
+                        "created": timezone.now().isoformat(),
+                        "options": {
+                            key: options[key]
+                            for key in (
+                                "threads",
+                                "duration",
+                                "write_share",
+                                "no_tuning",
+                                "seed",
+                            )
+                        },
+                        "journal_mode": journal_mode,
+                        "results": results,
+                    },
+                    file,
+                    indent=2,
+                    sort_keys=True,
+                )
+
+    def load_samples(self, rnd):
+        reviews = list(
+            Review.objects.order_by("pk").values_list("title_id", "pk")
+        )
+        users = list(
+            User.objects.filter(username__startswith=USERNAME_PREFIX)
+            .order_by("pk")
+        )
+        if not (reviews and users):
+            raise CommandError("Not enough data, run generate_dataset first.")
+        self.reviews = rnd.sample(reviews, min(SAMPLE_SIZE, len(reviews)))
+        self.headers = [
+            {"HTTP_AUTHORIZATION": f"Bearer {AccessToken.for_user(user)}"}
+            for user in rnd.sample(users, min(SAMPLE_SIZE, len(users)))
+        ]
+
+    @contextmanager
+    def tuned(self):
+        connection.close()
+        yield
+        connection.close()
+
+    @contextmanager
+    def untuned(self):
+        database = connections.databases[DEFAULT_DB_ALIAS]
+        conn_max_age = database["CONN_MAX_AGE"]
+        database["CONN_MAX_AGE"] = 0
+        connection.close()
+        try:
+            with override_settings(SQLITE_PRAGMAS={"journal_mode": "delete"}):
+                yield
+        finally:
+            database["CONN_MAX_AGE"] = conn_max_age
+            connection.close()
+
+    def worker(self, index, samples, options):
+        rnd = random.Random(options["seed"] + index + 1)
+        client = Client(raise_request_exception=False)
+        deadline = time.perf_counter() + options["duration"]
+        measured = []
+        try:
+            while time.perf_counter() < deadline:
+                title_id, review_id = rnd.choice(self.reviews)
+                headers = rnd.choice(self.headers)
+                url = f"/api/v1/titles/{title_id}/reviews/"
+                started = time.perf_counter()
+                if rnd.random() < options["write_share"]:
+                    kind = "write"
+                    response = client.post(
+                        f"{url}{review_id}/comments/",
+                        {"text": "Комментарий"},
+                        **headers,
+                    )
+                else:
+                    kind = "read"
+                    url = rnd.choice(
+                        (
+                            f"/api/v1/titles/{title_id}/",
+                            url,
+                            f"{url}{review_id}/comments/",
+                        )
+                    )
+                    response = client.get(url, **headers)
+                measured.append(
+                    (
+                        kind,
+                        (time.perf_counter() - started) * 1000,
+                        response.status_code,
+                    )
+                )
+        finally:
+            connections.close_all()
+        for kind, latency, status in measured:
+            samples[kind].append((latency, status))
+
+    def summarize(self, samples, elapsed):
+        latencies = [latency for latency, _ in samples]
+        statuses = Counter(str(status) for _, status in samples)
+        percentiles = (
+            statistics.quantiles(latencies, n=100)
+            if len(latencies) > 1
+            else latencies * 99
+        )
+        return {
+            "requests": len(samples),
+            "throughput_rps": round(len(samples) / elapsed, 1),
+            "p50_ms": round(percentiles[49], 3),
+            "p95_ms": round(percentiles[94], 3),
+            "p99_ms": round(percentiles[98], 3),
+            "failed": sum(status >= 400 for _, status in samples),
+            "status_codes": dict(statuses),
+        }
@@ -0,0 +1,174 @@
+import io
+import json
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
+
+from api.views import ReviewViewSet, TitleViewSet
+from core.parsers import FastJSONParser
+from core.renderers import FastJSONRenderer
+from reviews.models import Title
+
+# DRF's own JSON codec and the one the API uses.
+CODECS = {
+    "drf": (JSONRenderer, JSONParser),
+    "fast": (FastJSONRenderer, FastJSONParser),
+}
+# Query strings measured for every list, the first one is the full payload.
+COMBINATIONS = {
+    "title": (
+        "",
+        "fields=id,name,rating",
+        "exclude=description",
+        "exclude=description,genre,category",
+    ),
+    "review": (
+        "",
+        "fields=id,score,author",
+        "exclude=text",
+    ),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure query, serialization, rendering and parsing time and "
+        "payload size of the title and review lists for each field "
+        "selection."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=50)
+        parser.add_argument("--page-size", type=int, default=100)
+        parser.add_argument("--output", help="Write results to a JSON file.")
+
+    def handle(self, *args, **options):
+        title = (
+            Title.objects.annotate(reviews_count=Count("reviews"))
+            .order_by("-reviews_count", "pk")
+            .first()
+        )
+        if title is None or not title.reviews_count:
+            raise CommandError("Not enough data, run generate_dataset first.")
+        lists = {
+            "title": (TitleViewSet, "/api/v1/titles/", {}),
+            "review": (
+                ReviewViewSet,
+                f"/api/v1/titles/{title.pk}/reviews/",
+                {"title_id": str(title.pk)},
+            ),
+        }
+        self.factory = APIRequestFactory()
+        self.codecs = {
+            name: (renderer_class(), parser_class())
+            for name, (renderer_class, parser_class) in CODECS.items()
+        }
+
+        results = {}
+        for name, queries in COMBINATIONS.items():
+            viewset, path, kwargs = lists[name]
+            for query in queries:
+                result = self.measure(viewset, path, kwargs, query, options)
+                results[f"{name}?{query}"] = result
+                self.stdout.write(
+                    f"{name:<7} {query or '(all fields)':<36} "
+                    f"{result['bytes']:>8} B  "
+                    f"fetch {result['fetch_ms']:7.2f} ms  "
+                    f"serialize {result['serialize_ms']:7.2f} ms  "
+                    f"queries {result['queries']}"
+                )
+                for codec in self.codecs:
+                    self.stdout.write(
+                        f"{'':<8}{codec:<36} "
+                        f"render {result['render_ms'][codec]:6.2f} ms  "
+                        f"parse {result['parse_ms'][codec]:6.2f} ms"
+                    )
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as file:
+                json.dump(
+                    {
+                        "created": timezone.now().isoformat(),
+                        "options": {
+                            key: options[key]
+                            for key in ("repeat", "page_size")
+                        },
+                        "results": results,
+                    },
+                    file,
+                    indent=2,
+                    sort_keys=True,
+                )
+
+    def get_view(self, viewset, path, kwargs, query):
+        view = viewset(
+            action_map={"get": "list"},
+            args=(),
+            kwargs=kwargs,
+            format_kwarg=None,
+        )
+        view.request = view.initialize_request(
+            self.factory.get(f"{path}?{query}")
+        )
+        view.headers = {}
+        return view
+
+    def measure(self, viewset, path, kwargs, query, options):
+        timings = {"fetch": [], "serialize": []}
+        for _ in range(options["repeat"]):
+            view = self.get_view(viewset, path, kwargs, query)
+            started = time.perf_counter()
+            with CaptureQueriesContext(connection) as context:
+                objects = list(
+                    view.filter_queryset(view.get_queryset())[
+                        :options["page_size"]
+                    ]
+                )
+            fetched = time.perf_counter()
+            data = view.get_serializer(objects, many=True).data
+            timings["fetch"].append((fetched - started) * 1000)
+            timings["serialize"].append((time.perf_counter() - fetched) * 1000)
+
+        render = {}
+        parse = {}
+        contents = {}
+        for name, (renderer, parser) in self.codecs.items():
+            render[name], contents[name] = self.timed(
+                renderer.render, data, repeat=options["repeat"]
+            )
+            parse[name], parsed = self.timed(
+                lambda content: parser.parse(io.BytesIO(content)),
+                contents[name],
+                repeat=options["repeat"],
+            )
+            if parsed != json.loads(contents["drf"]):
+                raise CommandError(
+                    f"{name} JSON of {path}?{query} differs from DRF's."
+                )
+        return {
+            "rows": len(objects),
+            "bytes": len(contents["drf"]),
+            "queries": len(context.captured_queries),
+            "render_ms": render,
+            "parse_ms": parse,
+            **{
+                f"{step}_ms": round(statistics.median(values), 3)
+                for step, values in timings.items()
+            },
+        }
+
+    def timed(self, function, argument, repeat):
+        durations = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = function(argument)
+            durations.append((time.perf_counter() - started) * 1000)
+        return round(statistics.median(durations), 3), result
@@ -0,0 +1,149 @@
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from api.cache import response_cache
+from api.signals import CACHE_NAMESPACES
+from api.urls import v1_router
+from reviews.models import Comment, Genre
+from users.models import Role, User
+
+# A table read from end to end. Index scans ("SCAN t USING INDEX i") walk an
+# index in order and stop at the page size, so they are not reported.
+FULL_SCAN = re.compile(r"^SCAN (?:TABLE )?(?!CONSTANT ROW)(\S+)$")
+
+# Query strings exercised on top of the bare list of a viewset.
+LIST_VARIANTS = {
+    "title": (
+        "?cursor=",
+        "?ordering=-rating",
+        "?genre={genre}&category={category}",
+        "?genre__all={genre}",
+        "?search={word}",
+        "?min_rating=5",
+    ),
+    "review": ("?cursor=", "?search={word}"),
+    "comment": ("?cursor=",),
+    "users": ("?cursor=", "?search={username}"),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Run EXPLAIN QUERY PLAN for every SELECT issued by the GET endpoints "
+        "of the v1 viewsets and fail if any of them scans a whole table."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--allow",
+            action="append",
+            default=[],
+            metavar="TABLE",
+            help="Accept full scans of this table; may be repeated.",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            raise CommandError("EXPLAIN QUERY PLAN is SQLite-specific.")
+        admin = (
+            User.objects.filter(role=Role.ADMIN).order_by("pk").first()
+            or User.objects.filter(is_superuser=True).order_by("pk").first()
+        )
+        comment = (
+            Comment.objects.select_related("review__title").order_by("pk")
+            .first()
+        )
+        if admin is None or comment is None:
+            raise CommandError(
+                "Need an admin user and at least one comment, run "
+                "generate_dataset first."
+            )
+        review = comment.review
+        title = review.title
+        genre = Genre.objects.filter(title=title).order_by("pk").first()
+        self.samples = {
+            "title_id": title.pk,
+            "review_id": review.pk,
+            "title": title.pk,
+            "review": review.pk,
+            "comment": comment.pk,
+            "category": title.category.slug if title.category else "",
+            "genre": genre.slug if genre else "",
+            "users": admin.username,
+            "username": admin.username,
+            "word": (review.text.split() or ["a"])[0],
+        }
+        self.client = APIClient()
+        self.client.force_authenticate(admin)
+
+        self.verbosity = options["verbosity"]
+        self.allowed = set(options["allow"])
+        self.explained = set()
+        failures = 0
+        for url in self.get_urls():
+            failures += self.audit(url)
+        if failures:
+            raise CommandError(f"{failures} queries scan a whole table.")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Explained {len(self.explained)} queries, no full scans"
+            )
+        )
+
+    def get_urls(self):
+        seen = set()
+        for pattern in v1_router.urls:
+            actions = getattr(pattern.callback, "actions", {})
+            route = pattern.pattern.regex.pattern
+            if "get" not in actions or "format" in route or route in seen:
+                continue
+            seen.add(route)
+            basename = pattern.name.rsplit("-", 1)[0]
+            kwargs = {
+                name: self.samples[basename if name in ("pk", "slug")
+                                   else name]
+                for name in pattern.pattern.regex.groupindex
+            }
+            url = "/api/v1/" + re.sub(
+                r"\(\?P<(\w+)>[^)]*\)",
+                lambda match: str(kwargs[match.group(1)]),
+                route.lstrip("^").rstrip("$"),
+            )
+            yield url
+            if pattern.name.endswith("-list"):
+                for variant in LIST_VARIANTS.get(basename, ()):
+                    yield url + variant.format(**self.samples)
+
+    def audit(self, url):
+        response_cache.invalidate(
+            *{ns for nss in CACHE_NAMESPACES.values() for ns in nss}
+        )
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.stdout.write(f"{url} -> {response.status_code}")
+        failures = 0
+        with connection.cursor() as cursor:
+            for query in context.captured_queries:
+                sql = query["sql"]
+                if not sql.startswith("SELECT") or sql in self.explained:
+                    continue
+                self.explained.add(sql)
+                cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+                plan = [row[-1] for row in cursor.fetchall()]
+                scans = [
+                    detail for detail in plan
+                    if (match := FULL_SCAN.match(detail))
+                    and match.group(1) not in self.allowed
+                ]
+                if scans or self.verbosity > 1:
+                    self.stdout.write(f"  {sql}")
+                    for detail in plan:
+                        self.stdout.write(f"    {detail}")
+                if scans:
+                    failures += 1
+                    self.stderr.write(f"  full scan: {', '.join(scans)}")
+        return failures
@@ -0,0 +1,41 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.cache import response_cache
+from api.signals import CACHE_NAMESPACES
+from core.replicas import get_replicas, refresh_replicas
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy the primary SQLite database into the DATABASE_REPLICAS with "
+        "the sqlite backup API."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep refreshing every --interval seconds.",
+        )
+        parser.add_argument("--interval", type=float, default=5)
+
+    def handle(self, *args, **options):
+        if not get_replicas():
+            raise CommandError("DATABASE_REPLICAS is empty.")
+        while True:
+            started = time.monotonic()
+            refresh_replicas()
+            # Responses cached from the previous copy may be older than
+            # what the replicas serve now.
+            response_cache.invalidate(
+                *{ns for nss in CACHE_NAMESPACES.values() for ns in nss}
+            )
+            self.stdout.write(
+                f"Refreshed {', '.join(get_replicas())} in "
+                f"{time.monotonic() - started:.2f}s"
+            )
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
@@ -1,8 +1,21 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Count, Max, Prefetch
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
 from rest_framework.mixins import (
     CreateModelMixin, DestroyModelMixin, ListModelMixin, RetrieveModelMixin
 )
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
+from core.replicas import (choose_replica, get_replicas, is_pinned,
+                           pin_to_primary, replica_reads)
+
+from .cache import response_cache
+from .serializers import get_sparse_fields
+
 
 class ModelMixinSet(
     CreateModelMixin, ListModelMixin, DestroyModelMixin, GenericViewSet
@@ -12,3 +25,247 @@ class ModelMixinSet(
 
 class SignUpMixinSet(RetrieveModelMixin, CreateModelMixin, GenericViewSet):
     pass
+
+
+class ResponseCacheMixin:
+    cache_namespace = None
+
+    def get_cached_response(self, handler, request, *args, **kwargs):
+        if getattr(request, "in_batch_transaction", False):
+            # Cached responses may predate the writes of the batch, and the
+            # ones built inside it may never be committed.
+            return handler(request, *args, **kwargs)
+        key = response_cache.get_key(self.cache_namespace, request)
+        if not getattr(self, "pinned_to_primary", False):
+            data = response_cache.get(self.cache_namespace, key)
+            if data is not None:
+                return Response(data, headers={"X-Cache": "HIT"})
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            response_cache.set(key, response.data)
+        response["X-Cache"] = "MISS"
+        return response
+
+
+class CachedListMixin(ResponseCacheMixin):
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().list, request, *args, **kwargs
+        )
+
+
+class CachedRetrieveMixin(ResponseCacheMixin):
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+
+class ReplicaReadMixin:
+    """Serve safe-method requests from the read replicas.
+
+    A client that wrote through one of these views is pinned to the primary
+    for REPLICA_PIN_SECONDS to read its own writes. Pinned clients also skip
+    cached responses, which may have been built from a lagging replica.
+    """
+
+    pinned_to_primary = False
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method in SAFE_METHODS and get_replicas():
+            self.pinned_to_primary = is_pinned(request.user)
+            if not self.pinned_to_primary:
+                self.replica_reads_token = replica_reads.set(
+                    choose_replica()
+                )
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = self.__dict__.pop("replica_reads_token", None)
+        if token is not None:
+            replica_reads.reset(token)
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            pin_to_primary(request.user)
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+def get_select_related_paths(tree, prefix=""):
+    for name, subtree in tree.items():
+        if subtree:
+            yield from get_select_related_paths(subtree, f"{prefix}{name}__")
+        else:
+            yield f"{prefix}{name}"
+
+
+class SparseQuerysetMixin:
+    """Load only what the `?fields=` / `?exclude=` selection shows.
+
+    Model fields behind the serializer fields left out are deferred, and
+    relations behind them are neither joined nor prefetched. The
+    `cursor_ordering` fields stay loaded for keyset pagination.
+    """
+
+    def get_sparse_sources(self):
+        """Return the sources of the left out fields, or an empty set."""
+        fields = self.get_serializer_class()().fields
+        readable = [
+            name for name, field in fields.items() if not field.write_only
+        ]
+        selected = get_sparse_fields(self.request, readable)
+        if len(selected) == len(readable):
+            return set()
+        kept = {
+            fields[name].source.split(".")[0] for name in selected
+        } | {name.lstrip("-") for name in getattr(self, "cursor_ordering", ())}
+        return {
+            fields[name].source.split(".")[0]
+            for name in readable if name not in selected
+        } - kept
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.request.method not in SAFE_METHODS:
+            return queryset
+        deferred = []
+        relations = set()
+        for source in self.get_sparse_sources():
+            try:
+                field = queryset.model._meta.get_field(source)
+            except FieldDoesNotExist:
+                continue
+            if field.is_relation:
+                relations.add(source)
+            if field.concrete and not field.many_to_many:
+                deferred.append(source)
+        if relations:
+            prefetches = [
+                lookup for lookup in queryset._prefetch_related_lookups
+                if (
+                    lookup.prefetch_through
+                    if isinstance(lookup, Prefetch) else lookup
+                ).split("__")[0] not in relations
+            ]
+            queryset = queryset.prefetch_related(None).prefetch_related(
+                *prefetches
+            )
+            select_related = queryset.query.select_related
+            if isinstance(select_related, dict):
+                paths = list(
+                    get_select_related_paths(
+                        {
+                            name: subtree
+                            for name, subtree in select_related.items()
+                            if name not in relations
+                        }
+                    )
+                )
+                queryset = queryset.select_related(None)
+                if paths:
+                    queryset = queryset.select_related(*paths)
+        return queryset.defer(*deferred) if deferred else queryset
+
+
+class FacetedListMixin:
+    """Add `facets` bucket counts to the page for `?facets=a,b`.
+
+    The counts cover the whole filtered queryset, not only the page, and
+    come from the queryset's `facet_counts()`.
+    """
+
+    facets_param = "facets"
+    facet_fields = ()
+
+    def get_facet_names(self, request):
+        value = request.query_params.get(self.facets_param, "")
+        names = [name.strip() for name in value.split(",") if name.strip()]
+        unknown = set(names) - set(self.facet_fields)
+        if unknown:
+            raise ValidationError(
+                {
+                    self.facets_param: [
+                        f"Unknown facets: {', '.join(sorted(unknown))}. "
+                        f"Choose from {', '.join(self.facet_fields)}."
+                    ]
+                }
+            )
+        return list(dict.fromkeys(names))
+
+    def list(self, request, *args, **kwargs):
+        names = self.get_facet_names(request)
+        response = super().list(request, *args, **kwargs)
+        if names and response.status_code == 200:
+            response.data["facets"] = self.filter_queryset(
+                self.get_queryset()
+            ).facet_counts(*names)
+        return response
+
+
+class ConditionalGetMixin:
+    """Answer list and retrieve with 304 when the ETag matches.
+
+    The ETag is built from the newest `updated` stamp and the row count.
+    Views with a `cache_namespace` keep it next to their cached responses,
+    so a cache hit is answered without a query.
+    """
+
+    _object = None
+
+    def get_object(self):
+        # retrieve() fetches the object for the ETag, the serializer
+        # reuses it.
+        if self._object is None:
+            self._object = super().get_object()
+        return self._object
+
+    def get_etag(self, request, validators):
+        namespace = getattr(self, "cache_namespace", None)
+        if (
+            namespace is None
+            or getattr(request, "in_batch_transaction", False)
+            or getattr(self, "pinned_to_primary", False)
+        ):
+            return self.build_etag(*validators())
+        key = f"{response_cache.get_key(namespace, request)}:etag"
+        etag = response_cache.cache.get(key)
+        if etag is None:
+            etag = self.build_etag(*validators())
+            response_cache.set(key, etag)
+        return etag
+
+    def build_etag(self, last_modified, count):
+        # An empty string rather than None, so that it can be cached.
+        if last_modified is None:
+            return ""
+        return quote_etag(f"{last_modified.timestamp()}-{count}")
+
+    def get_conditional_response(self, handler, validators, request,
+                                 *args, **kwargs):
+        etag = self.get_etag(request, validators)
+        if not etag:
+            return handler(request, *args, **kwargs)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response["ETag"] = etag
+        return response
+
+    def get_list_validators(self):
+        stats = self.filter_queryset(self.get_queryset()).aggregate(
+            last_modified=Max("updated"), count=Count("pk")
+        )
+        return stats["last_modified"], stats["count"]
+
+    def list(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            super().list, self.get_list_validators, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            super().retrieve,
+            lambda: (self.get_object().updated, 1),
+            request,
+            *args,
+            **kwargs,
+        )
@@ -0,0 +1,73 @@
+from rest_framework import pagination
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import OrderingFilter
+
+MAX_PAGE_SIZE = 100
+
+
+class PageNumberPagination(pagination.PageNumberPagination):
+    page_size_query_param = "page_size"
+    max_page_size = MAX_PAGE_SIZE
+
+
+class KeysetPagination(pagination.CursorPagination):
+    page_size_query_param = "page_size"
+    max_page_size = MAX_PAGE_SIZE
+
+    def get_ordering(self, request, queryset, view):
+        for backend in getattr(view, "filter_backends", ()):
+            if (
+                issubclass(backend, OrderingFilter)
+                and backend.ordering_param in request.query_params
+            ):
+                raise ValidationError(
+                    {
+                        backend.ordering_param: [
+                            "Cannot be combined with cursor pagination."
+                        ]
+                    }
+                )
+        return tuple(view.cursor_ordering)
+
+
+class CursorOrPageNumberPagination(pagination.BasePagination):
+    """Keyset pagination when `cursor` is in the query, page numbers otherwise.
+
+    Viewsets opt in by declaring `cursor_ordering`, a stable ordering that
+    ends with `id`. Clients start keyset paging with an empty `?cursor=`,
+    while old `?page=N` links keep working. Keyset pages always follow
+    `cursor_ordering`: `?ordering=` is rejected with 400, and `?search=`
+    results are filtered but not ranked by relevance.
+    """
+
+    cursor_query_param = KeysetPagination.cursor_query_param
+
+    def __init__(self):
+        self.paginator = None
+
+    def get_paginator(self, request):
+        if self.cursor_query_param in request.query_params:
+            return KeysetPagination()
+        return PageNumberPagination()
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.paginator = self.get_paginator(request)
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return PageNumberPagination().get_paginated_response_schema(schema)
+
+    def to_html(self):
+        return self.paginator.to_html()
+
+    def get_results(self, data):
+        return data["results"]
+
+    def get_schema_operation_parameters(self, view):
+        return (
+            PageNumberPagination().get_schema_operation_parameters(view)
+            + KeysetPagination().get_schema_operation_parameters(view)[:1]
+        )
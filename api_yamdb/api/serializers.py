@@ -1,13 +1,77 @@
+from django.conf import settings
 from django.contrib.auth import authenticate
+from django.db import transaction
 from rest_framework import serializers
 from rest_framework.exceptions import NotFound
+from rest_framework.permissions import SAFE_METHODS
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from rest_framework_simplejwt.tokens import AccessToken
 
-from reviews.models import Category, Comment, Genre, Review, Title, User
+from reviews.models import (Category, Comment, Genre, LeaderboardEntry,
+                            Review, Title, User)
+from reviews.search import highlight
 from reviews.validators import validate_title_year
 
 
+FIELDS_PARAM = "fields"
+EXCLUDE_PARAM = "exclude"
+
+
+def get_sparse_fields(request, names):
+    """Return the `names` kept by `?fields=` and `?exclude=` of a read.
+
+    Raises ValidationError for names the serializer does not have.
+    """
+    if request is None or request.method not in SAFE_METHODS:
+        return list(names)
+    selection = {}
+    errors = {}
+    for param in (FIELDS_PARAM, EXCLUDE_PARAM):
+        value = request.query_params.get(param, "")
+        selection[param] = {
+            name.strip() for name in value.split(",") if name.strip()
+        }
+        unknown = selection[param] - set(names)
+        if unknown:
+            errors[param] = [
+                f"Unknown fields: {', '.join(sorted(unknown))}. "
+                f"Choose from {', '.join(names)}."
+            ]
+    if errors:
+        raise serializers.ValidationError(errors)
+    return [
+        name for name in names
+        if (not selection[FIELDS_PARAM] or name in selection[FIELDS_PARAM])
+        and name not in selection[EXCLUDE_PARAM]
+    ]
+
+
+class SparseFieldsMixin:
+    """Trim the representation with `?fields=a,b` and `?exclude=c`.
+
+    Applies to the top-level serializer of a read request only; nested
+    serializers and the fields of write requests are left alone.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        if parent is not None:
+            return fields
+        readable = [
+            name for name, field in fields.items() if not field.write_only
+        ]
+        selected = set(
+            get_sparse_fields(self.context.get("request"), readable)
+        )
+        return {
+            name: field for name, field in fields.items()
+            if field.write_only or name in selected
+        }
+
+
 class GenreField(serializers.SlugRelatedField):
     def to_representation(self, value):
         serializer = GenreSerializer(value)
@@ -20,7 +84,12 @@ class CategoryField(serializers.SlugRelatedField):
         return serializer.data
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class SnippetField(serializers.CharField):
+    def to_representation(self, value):
+        return highlight(value)
+
+
+class ReviewSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     author = serializers.SlugRelatedField(
         slug_field="username",
         read_only=True,
@@ -29,23 +98,13 @@ class ReviewSerializer(serializers.ModelSerializer):
     title = serializers.HiddenField(
         default=serializers.PrimaryKeyRelatedField(read_only=True)
     )
+    snippet = SnippetField(read_only=True, source="search_snippet")
 
     class Meta:
         model = Review
-        fields = ("id", "text", "author", "score", "pub_date", "title")
-
-    def validate(self, data):
-        if (
-            Review.objects.filter(
-                author=self.context["request"].user,
-                title=self.context.get("view").kwargs.get("title_id"),
-            ).exists()
-            and self.context.get("request").method == "POST"
-        ):
-            raise serializers.ValidationError(
-                "You cannot leave a second review for this title."
-            )
-        return data
+        fields = (
+            "id", "text", "author", "score", "pub_date", "title", "snippet"
+        )
 
     def validate_score(self, value):
         if isinstance(value, int) and 1 <= value <= 10:
@@ -55,7 +114,7 @@ class ReviewSerializer(serializers.ModelSerializer):
         ))
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = (
@@ -74,28 +133,74 @@ class UserSerializer(serializers.ModelSerializer):
         }
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Category
         fields = ("name", "slug")
 
 
-class GenreSerializer(serializers.ModelSerializer):
+class GenreSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Genre
         fields = ("name", "slug")
 
 
-class TitleReadSerializer(serializers.ModelSerializer):
+class TitleReadSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     category = CategorySerializer(read_only=True)
     genre = GenreSerializer(read_only=True, many=True)
     rating = serializers.IntegerField(read_only=True)
+    snippet = SnippetField(read_only=True, source="search_snippet")
 
     class Meta:
-        fields = "__all__"
+        fields = (
+            "id",
+            "name",
+            "year",
+            "rating",
+            "description",
+            "genre",
+            "category",
+            "snippet",
+        )
         model = Title
 
 
+class LeaderboardSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    title = TitleReadSerializer(read_only=True)
+    reviews = serializers.IntegerField(read_only=True, source="rating_count")
+
+    class Meta:
+        fields = ("title", "score", "reviews")
+        model = LeaderboardEntry
+
+
+class ScoredTitleSerializer(SparseFieldsMixin, serializers.Serializer):
+    title = TitleReadSerializer(read_only=True)
+    score = serializers.FloatField(read_only=True)
+
+
+class BatchOperationSerializer(serializers.Serializer):
+    method = serializers.ChoiceField(
+        choices=("GET", "POST", "PATCH", "DELETE")
+    )
+    url = serializers.CharField()
+    body = serializers.JSONField(required=False)
+
+
+class BatchSerializer(serializers.Serializer):
+    operations = BatchOperationSerializer(many=True, allow_empty=False)
+    atomic = serializers.BooleanField(default=False)
+    parallel = serializers.BooleanField(default=False)
+
+    def validate_operations(self, value):
+        limit = settings.BATCH_MAX_OPERATIONS
+        if len(value) > limit:
+            raise serializers.ValidationError(
+                f"Ensure this field has no more than {limit} elements."
+            )
+        return value
+
+
 class TitleWriteSerializer(serializers.ModelSerializer):
     category = serializers.SlugRelatedField(
         queryset=Category.objects.all(), slug_field="slug"
@@ -105,14 +210,14 @@ class TitleWriteSerializer(serializers.ModelSerializer):
     )
 
     class Meta:
-        fields = "__all__"
+        fields = ("id", "name", "year", "description", "genre", "category")
         model = Title
 
     def validate_year(self, value):
         return validate_title_year(value)
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     author = serializers.SlugRelatedField(
         slug_field="username",
         read_only=True,
@@ -143,13 +248,10 @@ class SignUpSerializer(serializers.ModelSerializer):
             )
         return username
 
+    @transaction.atomic
     def create(self, validated_data):
         user = User.objects.create_user(**validated_data)
-        user.email_user(
-            subject="confirmation_code",
-            message=f"Ваш код - {user.confirmation_code}",
-            fail_silently=False,
-        )
+        user.send_confirmation_code()
         return {
             "email": user.email,
             "username": user.username,
@@ -0,0 +1,30 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from core.transactions import collect_on_commit
+from reviews.models import Category, Genre, GenreTitle, Review, Title
+
+from .cache import response_cache
+
+CACHE_NAMESPACES = {
+    Category: ("categories", "titles"),
+    Genre: ("genres", "titles"),
+    Title: ("titles",),
+    GenreTitle: ("titles",),
+    Review: ("titles",),
+}
+
+
+def invalidate_namespaces(items):
+    response_cache.invalidate(*set().union(*items))
+
+
+def invalidate_response_cache(sender, **kwargs):
+    # One cache write per transaction rather than one per row, e.g. for the
+    # reviews of a cascading title delete.
+    collect_on_commit(invalidate_namespaces, CACHE_NAMESPACES[sender])
+
+
+for model in CACHE_NAMESPACES:
+    post_save.connect(invalidate_response_cache, sender=model)
+    post_delete.connect(invalidate_response_cache, sender=model)
+m2m_changed.connect(invalidate_response_cache, sender=GenreTitle)
@@ -1,9 +1,9 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from .views import (CategoryViewSet, CommentViewSet, GenreViewSet,
-                    ReviewViewSet, SignUpView, TitleViewSet, TokenObtainView,
-                    UserViewSet)
+from .views import (BatchView, CategoryViewSet, CommentViewSet,
+                    GenreViewSet, ReviewViewSet, SignUpView, TitleViewSet,
+                    TokenObtainView, UserViewSet)
 
 v1_router = DefaultRouter()
 v1_router.register("users", UserViewSet, basename="users")
@@ -27,5 +27,8 @@ urlpatterns = [
         name="auth-signup",
     ),
     path("v1/auth/token/", TokenObtainView.as_view(), name="auth-token"),
+    path(
+        "v1/batch/", BatchView.as_view(router=v1_router), name="batch"
+    ),
     path("v1/", include(v1_router.urls)),
 ]
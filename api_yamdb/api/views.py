@@ -1,42 +1,89 @@
-from django.db.models import Avg
-from django.shortcuts import get_object_or_404
+from django.db import IntegrityError, transaction
+from django.utils.functional import cached_property
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import permissions, status, viewsets
 from rest_framework.decorators import action
-from rest_framework.exceptions import MethodNotAllowed
-from rest_framework.filters import SearchFilter
+from rest_framework.exceptions import MethodNotAllowed, ValidationError
+from rest_framework.filters import OrderingFilter, SearchFilter
+from rest_framework.generics import get_object_or_404
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.views import APIView
 from rest_framework_simplejwt.views import TokenViewBase
 
-from api.mixins import ModelMixinSet, SignUpMixinSet
-from reviews.models import Category, Genre, Review, Title, User
-
-from .filters import TitleFilter
+from api.mixins import (CachedListMixin, CachedRetrieveMixin,
+                        ConditionalGetMixin, FacetedListMixin, ModelMixinSet,
+                        ReplicaReadMixin, SignUpMixinSet,
+                        SparseQuerysetMixin)
+from core.user_cache import user_cache
+from reviews.models import (Category, Genre, LeaderboardEntry, Review, Title,
+                            TitleSimilarity, User)
+
+from .batch import Batch
+from .filters import FullTextSearchFilter, TitleFilter
+from .pagination import MAX_PAGE_SIZE, CursorOrPageNumberPagination
 from .permissions import (AdminOnly, AuthorOrCanEditOrReadOnly,
                           IsAdminOrReadOnly)
-from .serializers import (CategorySerializer, CommentSerializer,
-                          GenreSerializer, ReviewSerializer, SignUpSerializer,
+from .serializers import (BatchSerializer, CategorySerializer,
+                          CommentSerializer, GenreSerializer,
+                          LeaderboardSerializer,
+                          ReviewSerializer, ScoredTitleSerializer,
+                          SignUpSerializer,
                           TitleReadSerializer, TitleWriteSerializer,
                           TokenSerializer, UserSerializer)
 
+LEADERBOARD_LIMIT = 10
+
+
+def get_limit(request, default=LEADERBOARD_LIMIT):
+    try:
+        limit = int(request.query_params.get("limit", default))
+    except ValueError:
+        raise ValidationError({"limit": ["A valid integer is required."]})
+    return min(max(limit, 1), MAX_PAGE_SIZE)
 
-class ReviewViewSet(viewsets.ModelViewSet):
+
+class ReviewViewSet(
+    ReplicaReadMixin,
+    ConditionalGetMixin,
+    SparseQuerysetMixin,
+    viewsets.ModelViewSet,
+):
     serializer_class = ReviewSerializer
     permission_classes = (AuthorOrCanEditOrReadOnly,)
+    filter_backends = (FullTextSearchFilter,)
+    pagination_class = CursorOrPageNumberPagination
+    cursor_ordering = ("pub_date", "id")
     http_method_names = ["get", "post", "patch", "delete"]
 
-    def get_title(self):
+    @cached_property
+    def title(self):
         return get_object_or_404(Title, pk=self.kwargs.get("title_id"))
 
     def get_queryset(self):
-        return self.get_title().reviews.all()
+        return self.title.reviews.select_related("author")
 
+    @transaction.atomic
     def perform_create(self, serializer):
-        serializer.save(author=self.request.user, title=self.get_title())
+        # The unique_review constraint rejects a second review in the same
+        # INSERT, so there is no separate existence check.
+        try:
+            serializer.save(author=self.request.user, title=self.title)
+        except IntegrityError:
+            raise ValidationError(
+                {
+                    api_settings.NON_FIELD_ERRORS_KEY: [
+                        "You cannot leave a second review for this title."
+                    ]
+                }
+            )
 
 
-class CategoryViewSet(ModelMixinSet):
+class CategoryViewSet(
+    ReplicaReadMixin, CachedListMixin, SparseQuerysetMixin, ModelMixinSet
+):
+    cache_namespace = "categories"
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = (IsAdminOrReadOnly,)
@@ -44,8 +91,15 @@ class CategoryViewSet(ModelMixinSet):
     search_fields = ("name",)
     lookup_field = "slug"
 
+    def perform_destroy(self, instance):
+        Title.objects.filter(category=instance).touch()
+        instance.delete()
+
 
-class GenreViewSet(ModelMixinSet):
+class GenreViewSet(
+    ReplicaReadMixin, CachedListMixin, SparseQuerysetMixin, ModelMixinSet
+):
+    cache_namespace = "genres"
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
     permission_classes = (IsAdminOrReadOnly,)
@@ -53,37 +107,118 @@ class GenreViewSet(ModelMixinSet):
     search_fields = ("name",)
     lookup_field = "slug"
 
-
-class TitleViewSet(viewsets.ModelViewSet):
-    queryset = Title.objects.annotate(rating=Avg("reviews__score")).all()
+    def perform_destroy(self, instance):
+        Title.objects.filter(genre=instance).touch()
+        instance.delete()
+
+
+class TitleViewSet(
+    ReplicaReadMixin,
+    ConditionalGetMixin,
+    CachedListMixin,
+    CachedRetrieveMixin,
+    FacetedListMixin,
+    SparseQuerysetMixin,
+    viewsets.ModelViewSet,
+):
+    cache_namespace = "titles"
+    queryset = Title.objects.select_related("category").prefetch_related(
+        "genre"
+    )
     permission_classes = (IsAdminOrReadOnly,)
-    filter_backends = (DjangoFilterBackend,)
+    filter_backends = (
+        DjangoFilterBackend, FullTextSearchFilter, OrderingFilter
+    )
     filterset_class = TitleFilter
+    ordering_fields = ("name", "year", "rating")
+    facet_fields = ("genre", "category", "year")
+    pagination_class = CursorOrPageNumberPagination
+    cursor_ordering = ("name", "id")
     http_method_names = ["get", "post", "patch", "delete"]
 
     def get_serializer_class(self):
         if self.action in ("list", "retrieve"):
             return TitleReadSerializer
+        if self.action in ("top", "most_reviewed"):
+            return LeaderboardSerializer
+        if self.action == "similar":
+            return ScoredTitleSerializer
         return TitleWriteSerializer
 
+    def get_leaderboard(self, request, field):
+        # `field__gt=0` also leaves out the titles without a score.
+        filters = {f"{field}__gt": 0}
+        for scope in ("category", "genre"):
+            slug = request.query_params.get(scope)
+            if slug:
+                filters[f"{scope}__slug"] = slug
+            else:
+                filters[f"{scope}__isnull"] = True
+        entries = (
+            LeaderboardEntry.objects.filter(**filters)
+            .select_related("title__category")
+            .prefetch_related("title__genre")
+            .order_by(f"-{field}", "title")
+        )[:get_limit(request)]
+        return Response(self.get_serializer(entries, many=True).data)
+
+    @action(detail=False)
+    def top(self, request):
+        return self.get_cached_response(
+            self.get_leaderboard, request, "score"
+        )
+
+    @action(detail=False, url_path="most-reviewed")
+    def most_reviewed(self, request):
+        return self.get_cached_response(
+            self.get_leaderboard, request, "rating_count"
+        )
+
+    def get_similar(self, request, pk):
+        title = get_object_or_404(Title, pk=pk)
+        similarities = (
+            title.similarities.select_related("similar__category")
+            .prefetch_related("similar__genre")
+            .order_by("-score", "similar")
+        )[:get_limit(request)]
+        serializer = self.get_serializer(
+            [
+                {"title": similarity.similar, "score": similarity.score}
+                for similarity in similarities
+            ],
+            many=True,
+        )
+        return Response(serializer.data)
+
+    @action(detail=True)
+    def similar(self, request, pk=None):
+        return self.get_cached_response(self.get_similar, request, pk)
 
-class CommentViewSet(viewsets.ModelViewSet):
+
+class CommentViewSet(
+    ReplicaReadMixin,
+    ConditionalGetMixin,
+    SparseQuerysetMixin,
+    viewsets.ModelViewSet,
+):
     serializer_class = CommentSerializer
     permission_classes = (AuthorOrCanEditOrReadOnly,)
+    pagination_class = CursorOrPageNumberPagination
+    cursor_ordering = ("-pub_date", "-id")
     http_method_names = ["get", "post", "patch", "delete"]
 
     def get_review_pk(self):
         return self.kwargs.get("review_id")
 
+    @cached_property
+    def review(self):
+        return get_object_or_404(Review, pk=self.get_review_pk())
+
     def get_queryset(self):
-        queryset = get_object_or_404(
-            Review, pk=self.get_review_pk()
-        ).comments.all()
-        return queryset
+        return self.review.comments.select_related("author")
 
     def perform_create(self, serializer):
-        review = get_object_or_404(Review, pk=self.get_review_pk())
-        serializer.save(author=self.request.user, review=review)
+        serializer.save(author=self.request.user, review=self.review)
 
 
 class SignUpView(SignUpMixinSet):
@@ -112,11 +247,7 @@ class SignUpView(SignUpMixinSet):
             user = User.objects.get(username=username)
         except User.DoesNotExist:
             return Response(status=status.HTTP_404_NOT_FOUND)
-        user.email_user(
-            subject="confirmation_code",
-            message=f"Ваш код - {user.confirmation_code}",
-            fail_silently=False,
-        )
+        user.send_confirmation_code()
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
@@ -125,12 +256,14 @@ class TokenObtainView(TokenViewBase):
     serializer_class = TokenSerializer
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(SparseQuerysetMixin, viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = (permissions.IsAuthenticated,)
     filter_backends = (SearchFilter,)
     search_fields = ("=username",)
+    pagination_class = CursorOrPageNumberPagination
+    cursor_ordering = ("-date_joined", "-id")
     http_method_names = ("get", "post", "patch", "delete")
 
     def get_object(self):
@@ -138,25 +271,25 @@ class UserViewSet(viewsets.ModelViewSet):
         user = get_object_or_404(User, username=pk)
         return user
 
+    def perform_update(self, serializer):
+        user_cache.invalidate(serializer.instance.username)
+        super().perform_update(serializer)
+
     @action(methods=["get", "patch", "put", "delete"], detail=False)
     def me(self, request):
+        user = User.objects.get(pk=request.user.pk)
         if request.method == "GET":
-            serializer = self.get_serializer(request.user)
+            serializer = self.get_serializer(user)
             return Response(serializer.data)
 
         if request.method == "PATCH" or request.method == "PUT":
             partial = request.method == "PATCH"
             data = request.data.copy()
-            data["role"] = request.user.role
-            serializer = self.get_serializer(
-                request.user, data=data, partial=partial
-            )
+            data["role"] = user.role
+            serializer = self.get_serializer(user, data=data, partial=partial)
             serializer.is_valid(raise_exception=True)
             self.perform_update(serializer)
 
-            if getattr(request.user, "_prefetched_objects_cache", None):
-                request.user._prefetched_objects_cache = {}
-
             return Response(serializer.data)
 
         if request.method == "DELETE":
@@ -164,7 +297,61 @@ class UserViewSet(viewsets.ModelViewSet):
 
         return Response(status=status.HTTP_400_BAD_REQUEST)
 
+    @action(detail=False, url_path="me/recommendations")
+    def recommendations(self, request):
+        predictions = TitleSimilarity.objects.recommend(
+            request.user, get_limit(request)
+        )
+        titles = (
+            Title.objects.select_related("category")
+            .prefetch_related("genre")
+            .in_bulk([title_id for title_id, _ in predictions])
+        )
+        serializer = ScoredTitleSerializer(
+            [
+                {"title": titles[title_id], "score": score}
+                for title_id, score in predictions
+            ],
+            many=True,
+        )
+        return Response(serializer.data)
+
     def get_permissions(self):
-        if self.action == "me":
+        if self.action in ("me", "recommendations"):
             return (IsAuthenticated(),)
         return (AdminOnly(),)
+
+
+class BatchView(APIView):
+    """Run several router operations in one request.
+
+    Each operation is answered with its own status and body, in order. With
+    `parallel` consecutive reads run concurrently. With `atomic` the batch is
+    rolled back and answered with 400 as soon as one operation fails; the
+    operations after it are not run.
+    """
+
+    permission_classes = (permissions.AllowAny,)
+    router = None
+
+    @cached_property
+    def views(self):
+        return {pattern.callback for pattern in self.router.urls}
+
+    def post(self, request):
+        serializer = BatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        operations = serializer.validated_data["operations"]
+        batch = Batch(request, self.views)
+        if not serializer.validated_data["atomic"]:
+            return Response(
+                batch.execute(
+                    operations, serializer.validated_data["parallel"]
+                )
+            )
+        results, committed = batch.execute_atomic(operations)
+        return Response(
+            results,
+            status=status.HTTP_200_OK if committed
+            else status.HTTP_400_BAD_REQUEST,
+        )
@@ -29,15 +29,30 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "core.middleware.QueryTimingMiddleware",
+    "core.metrics.PrometheusMiddleware",
     "django.middleware.security.SecurityMiddleware",
-    "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
+    "core.middleware.PathScopedMiddleware",
+]
+
+# Run by core.middleware.PathScopedMiddleware for every path except the
+# LEAN_MIDDLEWARE_PATHS. The API authenticates with JWT on its own and uses
+# neither sessions nor messages, so it skips this part of the stack.
+SITE_MIDDLEWARE = [
+    "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+LEAN_MIDDLEWARE_PATHS = ("/api/",)
+
+# The admin looks for its session, auth and messages middleware in MIDDLEWARE
+# only; they run for it from SITE_MIDDLEWARE.
+SILENCED_SYSTEM_CHECKS = ["admin.E408", "admin.E409", "admin.E410"]
+
 ROOT_URLCONF = "api_yamdb.urls"
 
 TEMPLATES_DIR = os.path.join(BASE_DIR, "templates")
@@ -61,14 +76,67 @@ TEMPLATES = [
 WSGI_APPLICATION = "api_yamdb.wsgi.application"
 
 # Database
+# Connections are kept open for CONN_MAX_AGE seconds and reused by the
+# requests of the same worker thread.
 
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": os.path.join(BASE_DIR, "db.sqlite3"),
+        "CONN_MAX_AGE": 60,
     }
 }
 
+# Safe-method reads of the catalog viewsets go to an alias from
+# DATABASE_REPLICAS, chosen at random once per request, e.g. a "replica"
+# entry in DATABASES pointing at a copy kept up to date by
+# `manage.py refresh_replicas --loop`. A client that wrote reads from the
+# primary for the next REPLICA_PIN_SECONDS.
+DATABASE_ROUTERS = ["core.replicas.ReplicaRouter"]
+DATABASE_REPLICAS = []
+REPLICA_PIN_SECONDS = 5
+
+# Applied by core.db to every new SQLite connection. In WAL mode readers do
+# not block the writer and the other way round, and synchronous=NORMAL only
+# syncs on checkpoints, which is still safe against corruption. cache_size is
+# in KiB when negative, busy_timeout in milliseconds.
+SQLITE_PRAGMAS = {
+    "journal_mode": "wal",
+    "synchronous": "normal",
+    "mmap_size": 256 * 1024 * 1024,
+    "cache_size": -64 * 1024,
+    "busy_timeout": 5000,
+}
+
+# Cache
+# Switch to django.core.cache.backends.filebased.FileBasedCache with a shared
+# LOCATION to share cached API responses between worker processes.
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+}
+
+API_CACHE_ALIAS = "default"
+API_CACHE_TIMEOUT = 300
+
+# Share of requests measured by QueryTimingMiddleware and whether each
+# measured request is also logged as a JSON line.
+QUERY_TIMING_SAMPLE_RATE = 1.0
+QUERY_TIMING_LOG = False
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "core.middleware": {"handlers": ["console"], "level": "INFO"},
+    },
+}
+
 # Password validation
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -106,9 +174,18 @@ STATICFILES_DIRS = (os.path.join(BASE_DIR, "static/"),)
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "core.authentication.CachedJWTAuthentication",
+    ],
+    "DEFAULT_RENDERER_CLASSES": [
+        "core.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "core.parsers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
     ],
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    "DEFAULT_PAGINATION_CLASS": "api.pagination.PageNumberPagination",
     "PAGE_SIZE": 10,
 }
 
@@ -121,6 +198,21 @@ SIMPLE_JWT = {
     "AUTH_TOKEN_CLASSES": ("rest_framework_simplejwt.tokens.AccessToken",),
 }
 
+# Operations accepted by /api/v1/batch/ and threads shared by the batches
+# that ask to run their reads in parallel.
+BATCH_MAX_OPERATIONS = 20
+BATCH_WORKERS = 4
+
+USER_CACHE_MAXSIZE = 1024
+USER_CACHE_TTL = 60
+
+# Leaderboards rank titles by a Bayesian average: the score is pulled towards
+# LEADERBOARD_PRIOR_MEAN as if every title had LEADERBOARD_MIN_REVIEWS extra
+# reviews, and titles with fewer real reviews are not ranked. The prior is a
+# constant, so a review only ever updates the entries of its own title.
+LEADERBOARD_MIN_REVIEWS = 5
+LEADERBOARD_PRIOR_MEAN = 5.5
+
 AUTHENTICATION_BACKENDS = (
     "django.contrib.auth.backends.ModelBackend",
     "core.custom_auth.AuthenticationWithoutPassword",
@@ -2,10 +2,13 @@ from django.contrib import admin
 from django.urls import include, path
 from django.views.generic import TemplateView
 
+from core.metrics import metrics_view
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/", include("api.urls")),
     path("redoc/",
          TemplateView.as_view(template_name="redoc.html"),
          name="redoc"),
+    path("metrics", metrics_view, name="metrics"),
 ]
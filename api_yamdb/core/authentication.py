@@ -0,0 +1,57 @@
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (AuthenticationFailed,
+                                                 InvalidToken)
+from rest_framework_simplejwt.settings import api_settings
+
+from .user_cache import CACHED_USER_FIELDS, user_cache
+
+UserModel = get_user_model()
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWT authentication that resolves users through `user_cache`.
+
+    The returned user has only `CACHED_USER_FIELDS` loaded, the rest are
+    deferred and fetched on first access.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            username = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            )
+
+        values = user_cache.get(username)
+        if values is None:
+            try:
+                values = (
+                    UserModel.objects.filter(username=username)
+                    .values(*CACHED_USER_FIELDS)
+                    .get()
+                )
+            except UserModel.DoesNotExist:
+                raise AuthenticationFailed(
+                    _("User not found"), code="user_not_found"
+                )
+            user_cache.set(username, values)
+
+        field_names = [
+            field.attname
+            for field in UserModel._meta.concrete_fields
+            if field.attname in values
+        ]
+        user = UserModel.from_db(
+            DEFAULT_DB_ALIAS,
+            field_names,
+            [values[name] for name in field_names],
+        )
+        if not user.is_active:
+            raise AuthenticationFailed(
+                _("User is inactive"), code="user_inactive"
+            )
+        return user
@@ -7,6 +7,3 @@ class AuthenticationWithoutPassword(ModelBackend):
         if username is None:
             username = request.data.get("username", "")
         return get_object_or_404(UserModel, username=username)
-
-    def get_user(self, user_id):
-        return get_object_or_404(UserModel, pk=user_id)
@@ -0,0 +1,90 @@
+import os
+import time
+
+from django.http import HttpResponse
+from prometheus_client import (CONTENT_TYPE_LATEST, REGISTRY,
+                               CollectorRegistry, Counter, Gauge, Histogram,
+                               generate_latest, multiprocess)
+
+UNRESOLVED_ROUTE = "unresolved"
+
+REQUESTS = Counter(
+    "yamdb_http_requests_total",
+    "HTTP requests by route, method and status.",
+    ("route", "method", "status"),
+)
+LATENCY = Histogram(
+    "yamdb_http_request_duration_seconds",
+    "HTTP request latency by route and method.",
+    ("route", "method"),
+    buckets=(
+        0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1, 2.5, 5, 10
+    ),
+)
+IN_PROGRESS = Gauge(
+    "yamdb_http_requests_in_progress",
+    "HTTP requests being served by route and method.",
+    ("route", "method"),
+    multiprocess_mode="livesum",
+)
+DB_QUERIES = Counter(
+    "yamdb_db_queries_total",
+    "SQL queries issued by sampled requests, by route.",
+    ("route",),
+)
+DB_DURATION = Counter(
+    "yamdb_db_query_duration_seconds_total",
+    "Time spent in SQL queries by sampled requests, by route.",
+    ("route",),
+)
+CACHE_REQUESTS = Counter(
+    "yamdb_response_cache_requests_total",
+    "Response cache lookups by namespace and result (hit or miss).",
+    ("namespace", "result"),
+)
+
+
+def get_registry():
+    """Merge the per-process files when PROMETHEUS_MULTIPROC_DIR is set."""
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def metrics_view(request):
+    return HttpResponse(
+        generate_latest(get_registry()), content_type=CONTENT_TYPE_LATEST
+    )
+
+
+class PrometheusMiddleware:
+    """Collect request metrics labelled with the resolved URL name."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        request.metrics_route = None
+        try:
+            response = self.get_response(request)
+        finally:
+            route = request.metrics_route or UNRESOLVED_ROUTE
+            if request.metrics_route is not None:
+                IN_PROGRESS.labels(route, request.method).dec()
+            LATENCY.labels(route, request.method).observe(
+                time.perf_counter() - started
+            )
+        REQUESTS.labels(route, request.method, response.status_code).inc()
+        stats = getattr(request, "query_stats", None)
+        if stats is not None:
+            DB_QUERIES.labels(route).inc(stats.count)
+            DB_DURATION.labels(route).inc(stats.duration)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        match = request.resolver_match
+        request.metrics_route = match.url_name or match.view_name
+        IN_PROGRESS.labels(request.metrics_route, request.method).inc()
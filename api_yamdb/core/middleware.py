@@ -0,0 +1,155 @@
+import json
+import logging
+import random
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.handlers.exception import convert_exception_to_response
+from django.db import connections
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+SLOWEST_SQL_LENGTH = 500
+
+
+class QueryStats:
+    """Execute wrapper counting queries and their total and worst time."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.slowest_duration = 0.0
+        self.slowest_sql = None
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - started
+            self.count += 1
+            self.duration += duration
+            if duration > self.slowest_duration:
+                self.slowest_duration = duration
+                self.slowest_sql = sql
+
+
+class QueryTimingMiddleware:
+    """Report SQL query count and DB time of sampled requests.
+
+    Sampled responses get a `Server-Timing` header, and with
+    `QUERY_TIMING_LOG` enabled one JSON log line with the slowest statement.
+    The collected stats are available to views as `request.query_stats`.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, "QUERY_TIMING_SAMPLE_RATE", 1.0)
+        self.log = getattr(settings, "QUERY_TIMING_LOG", False)
+
+    def __call__(self, request):
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        stats = request.query_stats = QueryStats()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(stats))
+            response = self.get_response(request)
+        total = time.perf_counter() - started
+
+        response["Server-Timing"] = (
+            f'db;desc="{stats.count} queries";'
+            f"dur={stats.duration * 1000:.2f}, "
+            f"total;dur={total * 1000:.2f}"
+        )
+        if self.log:
+            logger.info(
+                json.dumps(
+                    {
+                        "method": request.method,
+                        "path": request.path,
+                        "status": response.status_code,
+                        "queries": stats.count,
+                        "db_ms": round(stats.duration * 1000, 2),
+                        "total_ms": round(total * 1000, 2),
+                        "slowest_ms": round(stats.slowest_duration * 1000, 2),
+                        "slowest_sql": (stats.slowest_sql or "")[
+                            :SLOWEST_SQL_LENGTH
+                        ],
+                    },
+                    ensure_ascii=False,
+                )
+            )
+        return response
+
+
+class PathScopedMiddleware:
+    """Run `SITE_MIDDLEWARE` only outside of `LEAN_MIDDLEWARE_PATHS`.
+
+    The admin and the docs get sessions, CSRF, messages and clickjacking
+    protection as if the middleware were listed in `MIDDLEWARE` at this
+    position, while the stateless JWT API under the lean paths goes straight
+    to the view. The view, template response and exception hooks of the
+    nested middleware are forwarded in the order the handler would call them.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.lean_paths = tuple(getattr(settings, "LEAN_MIDDLEWARE_PATHS", ()))
+        self.view_hooks = []
+        self.template_response_hooks = []
+        self.exception_hooks = []
+        handler = get_response
+        for middleware_path in reversed(settings.SITE_MIDDLEWARE):
+            try:
+                middleware = import_string(middleware_path)(handler)
+            except MiddlewareNotUsed:
+                continue
+            if hasattr(middleware, "process_view"):
+                self.view_hooks.insert(0, middleware.process_view)
+            if hasattr(middleware, "process_template_response"):
+                self.template_response_hooks.append(
+                    middleware.process_template_response
+                )
+            if hasattr(middleware, "process_exception"):
+                self.exception_hooks.append(middleware.process_exception)
+            handler = convert_exception_to_response(middleware)
+        self.site_handler = handler
+
+    def is_lean(self, request):
+        return request.path_info.startswith(self.lean_paths)
+
+    def __call__(self, request):
+        if self.is_lean(request):
+            return self.get_response(request)
+        return self.site_handler(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if self.is_lean(request):
+            return None
+        for hook in self.view_hooks:
+            response = hook(request, view_func, view_args, view_kwargs)
+            if response is not None:
+                return response
+        return None
+
+    def process_template_response(self, request, response):
+        if self.is_lean(request):
+            return response
+        for hook in self.template_response_hooks:
+            response = hook(request, response)
+        return response
+
+    def process_exception(self, request, exception):
+        if self.is_lean(request):
+            return None
+        for hook in self.exception_hooks:
+            response = hook(request, exception)
+            if response is not None:
+                return response
+        return None
@@ -0,0 +1,75 @@
+from functools import lru_cache
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Escaped by DRF so that the output is also valid JavaScript.
+LINE_SEPARATORS = (
+    ("\u2028".encode(), b"\\u2028"),
+    ("\u2029".encode(), b"\\u2029"),
+)
+
+
+@lru_cache(maxsize=None)
+def get_encoder(ensure_ascii, allow_nan, compact):
+    """Return a DRF JSON encoder shared by all renderers; it keeps no state."""
+    return encoders.JSONEncoder(
+        ensure_ascii=ensure_ascii,
+        allow_nan=allow_nan,
+        separators=(",", ":") if compact else (", ", ": "),
+    )
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer producing the same JSON as DRF's, faster.
+
+    Compact UTF-8 responses are encoded with orjson when it is installed.
+    Types orjson does not know, like lazy strings and decimals, go through
+    the `default()` of DRF's encoder, and data orjson rejects, like integers
+    over 64 bits, falls back to DRF. Floats may be spelled differently
+    (`1e16` for `1e+16`) but keep their value, and NaN and infinities are
+    written as null where DRF's strict mode raises; SQLite stores them as
+    NULL, so model data never holds them. Without orjson the stdlib encoder
+    is built once per process instead of once per response. Indented output
+    for the browsable API is left to DRF.
+    """
+
+    def __init__(self):
+        encoder = get_encoder(self.ensure_ascii, not self.strict, self.compact)
+        self.default = encoder.default
+        self.encode = encoder.encode
+        self.use_orjson = (
+            orjson is not None and self.compact and not self.ensure_ascii
+        )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if indent is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.use_orjson:
+            try:
+                content = orjson.dumps(
+                    data,
+                    default=self.default,
+                    option=(
+                        orjson.OPT_NON_STR_KEYS
+                        | orjson.OPT_PASSTHROUGH_DATETIME
+                    ),
+                )
+            except orjson.JSONEncodeError:
+                return super().render(
+                    data, accepted_media_type, renderer_context
+                )
+        else:
+            content = self.encode(data).encode()
+        for separator, escaped in LINE_SEPARATORS:
+            if separator in content:
+                content = content.replace(separator, escaped)
+        return content
@@ -0,0 +1,78 @@
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Alias of the replica the current request reads from, if any.
+replica_reads = ContextVar("replica_reads", default=None)
+
+
+def get_replicas():
+    return getattr(settings, "DATABASE_REPLICAS", ())
+
+
+def choose_replica():
+    return random.choice(get_replicas())
+
+
+def reading_from_replica():
+    """Return the alias of the replica to read from, or None."""
+    alias = replica_reads.get()
+    return alias if alias in get_replicas() else None
+
+
+def get_pin_key(user):
+    return f"replica:pin:{user.pk}"
+
+
+def pin_to_primary(user):
+    """Send the reads of `user` to the primary for REPLICA_PIN_SECONDS."""
+    if user.is_authenticated and get_replicas():
+        caches[settings.API_CACHE_ALIAS].set(
+            get_pin_key(user), True, settings.REPLICA_PIN_SECONDS
+        )
+
+
+def is_pinned(user):
+    return user.is_authenticated and bool(
+        caches[settings.API_CACHE_ALIAS].get(get_pin_key(user))
+    )
+
+
+class ReplicaRouter:
+    """Route reads to the replica set in `replica_reads`.
+
+    The alias is chosen once per request, so that all queries of a response
+    read the same copy of the primary.
+
+    Everything else, including every write and all migrations, goes to the
+    primary. Views opt in through api.mixins.ReplicaReadMixin.
+    """
+
+    def db_for_read(self, model, **hints):
+        return reading_from_replica()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in get_replicas()
+
+
+def refresh_replicas(aliases=None):
+    """Overwrite SQLite replicas with a consistent copy of the primary.
+
+    Uses the sqlite3 backup API, which copies the whole database while
+    holding a read lock on the primary, so writers are not blocked.
+    """
+    primary = connections[DEFAULT_DB_ALIAS]
+    primary.ensure_connection()
+    for alias in aliases or get_replicas():
+        replica = connections[alias]
+        replica.ensure_connection()
+        primary.connection.backup(replica.connection)
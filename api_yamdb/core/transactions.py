@@ -0,0 +1,39 @@
+from django.db import transaction
+
+
+class CommitBatch:
+    """on_commit callback handing the collected items to `flush` at once."""
+
+    def __init__(self, flush):
+        self.flush = flush
+        self.items = []
+
+    def __call__(self):
+        self.flush(self.items)
+
+
+def collect_on_commit(flush, item, using=None):
+    """Add `item` to the list passed to `flush` when the transaction commits.
+
+    Every savepoint level gets its own batch, so rolling a savepoint back
+    drops its items together with its callback. Outside a transaction
+    `flush([item])` runs at once.
+    """
+    connection = transaction.get_connection(using)
+    if not connection.in_atomic_block:
+        flush([item])
+        return
+    # Django keeps the callbacks with the savepoints they were registered
+    # in and forgets the ones of rolled back savepoints.
+    sids = set(connection.savepoint_ids)
+    for callback_sids, callback in connection.run_on_commit:
+        if (
+            callback_sids == sids
+            and isinstance(callback, CommitBatch)
+            and callback.flush is flush
+        ):
+            callback.items.append(item)
+            return
+    batch = CommitBatch(flush)
+    batch.items.append(item)
+    connection.on_commit(batch)
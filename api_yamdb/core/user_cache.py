@@ -0,0 +1,52 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+CACHED_USER_FIELDS = (
+    "id", "username", "role", "is_staff", "is_superuser", "is_active"
+)
+
+
+class UserCache:
+    """Per-process LRU cache of the user fields permissions rely on."""
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, username):
+        with self._lock:
+            entry = self._entries.get(username)
+            if entry is None:
+                return None
+            expires, values = entry
+            if expires < time.monotonic():
+                del self._entries[username]
+                return None
+            self._entries.move_to_end(username)
+            return values
+
+    def set(self, username, values):
+        with self._lock:
+            self._entries[username] = (time.monotonic() + self.ttl, values)
+            self._entries.move_to_end(username)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, username):
+        with self._lock:
+            self._entries.pop(username, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache(
+    maxsize=getattr(settings, "USER_CACHE_MAXSIZE", 1024),
+    ttl=getattr(settings, "USER_CACHE_TTL", 60),
+)
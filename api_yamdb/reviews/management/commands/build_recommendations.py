@@ -0,0 +1,82 @@
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from api.cache import response_cache
+from reviews.models import Review, TitleSimilarity
+from reviews.recommendations import REVIEW_DTYPE, item_similarities
+
+
+class Command(BaseCommand):
+    help = (
+        "Build the item-item similarity model from review scores and store "
+        "the nearest neighbours of every title."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--neighbours",
+            type=int,
+            default=20,
+            help="Similar titles stored per title.",
+        )
+        parser.add_argument(
+            "--shrinkage",
+            type=float,
+            default=10,
+            help="Damp similarities backed by few common reviewers.",
+        )
+        parser.add_argument(
+            "--block-size",
+            type=int,
+            default=1000,
+            help="Titles compared per sparse matrix product.",
+        )
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        reviews = np.fromiter(
+            Review.objects.order_by()
+            .values_list("author_id", "title_id", "score")
+            .iterator(chunk_size=options["batch_size"]),
+            dtype=REVIEW_DTYPE,
+        )
+        loaded = time.monotonic()
+
+        stored = 0
+        with transaction.atomic():
+            TitleSimilarity.objects.all().delete()
+            for title_ids, similar_ids, scores in item_similarities(
+                reviews,
+                neighbours=options["neighbours"],
+                shrinkage=options["shrinkage"],
+                block_size=options["block_size"],
+            ):
+                TitleSimilarity.objects.bulk_create(
+                    (
+                        TitleSimilarity(
+                            title_id=title_id,
+                            similar_id=similar_id,
+                            score=score,
+                        )
+                        for title_id, similar_id, score in zip(
+                            title_ids.tolist(),
+                            similar_ids.tolist(),
+                            scores.tolist(),
+                        )
+                    ),
+                    options["batch_size"],
+                )
+                stored += title_ids.size
+        response_cache.invalidate("titles")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Stored {stored} neighbours from {reviews.size} reviews "
+                f"(loaded in {loaded - started:.1f}s, "
+                f"built in {time.monotonic() - loaded:.1f}s)"
+            )
+        )
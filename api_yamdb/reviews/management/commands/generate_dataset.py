@@ -0,0 +1,218 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Max
+
+from api.cache import response_cache
+from reviews.models import Category, Comment, Genre, GenreTitle, Review, Title
+from users.models import Role, User
+
+CATEGORIES = ("movie", "book", "music", "series", "game")
+GENRES = (
+    "drama", "comedy", "thriller", "horror", "fantasy", "detective",
+    "romance", "documentary", "western", "animation", "adventure", "sci-fi",
+)
+WORDS = (
+    "сюжет", "герой", "финал", "атмосфера", "музыка", "режиссёр", "актёры",
+    "диалоги", "темп", "идея", "картина", "книга", "история", "мир", "стиль",
+    "восторг", "скучно", "неожиданно", "сильно", "слабо", "красиво",
+)
+# Generated users are found by the benchmarks through this prefix.
+USERNAME_PREFIX = "bench_user_"
+
+
+def next_id(model):
+    return (model.objects.aggregate(last=Max("pk"))["last"] or 0) + 1
+
+
+def zipf_counts(total, size, exponent, cap):
+    """Split `total` into `size` counts following a Zipf law, each <= cap."""
+    weights = [1 / rank ** exponent for rank in range(1, size + 1)]
+    scale = total / sum(weights)
+    return [min(cap, max(1, round(weight * scale))) for weight in weights]
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-create a synthetic catalog with Zipf-distributed reviews for "
+        "benchmarks. Generated users are regular users and moderators with "
+        "random confirmation codes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--titles", type=int, default=1000)
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument(
+            "--reviews-per-title",
+            type=int,
+            default=20,
+            help="Mean number of reviews per title.",
+        )
+        parser.add_argument("--comments-per-review", type=float, default=1)
+        parser.add_argument("--max-genres", type=int, default=3)
+        parser.add_argument(
+            "--zipf",
+            type=float,
+            default=1.1,
+            help="Zipf exponent of the review count distribution.",
+        )
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        if options["reviews_per_title"] > options["users"]:
+            raise CommandError(
+                "--reviews-per-title cannot exceed --users: every user "
+                "reviews a title at most once."
+            )
+        self.random = random.Random(options["seed"])
+        self.batch_size = options["batch_size"]
+        started = time.monotonic()
+
+        with transaction.atomic():
+            category_ids = self.create_catalog(Category, CATEGORIES)
+            genre_ids = self.create_catalog(Genre, GENRES)
+            user_ids = self.create_users(options["users"])
+            title_ids = self.create_titles(
+                options["titles"],
+                category_ids,
+                genre_ids,
+                options["max_genres"],
+            )
+            counts = zipf_counts(
+                options["reviews_per_title"] * len(title_ids),
+                len(title_ids),
+                options["zipf"],
+                cap=len(user_ids),
+            )
+            review_ids = self.create_reviews(title_ids, user_ids, counts)
+            self.create_comments(
+                review_ids, user_ids, options["comments_per_review"]
+            )
+            Title.objects.filter(pk__in=title_ids).rebuild_ratings()
+        response_cache.invalidate("categories", "genres", "titles")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Generated {len(title_ids)} titles, {len(user_ids)} users, "
+                f"{len(review_ids)} reviews in "
+                f"{time.monotonic() - started:.1f}s"
+            )
+        )
+
+    def text(self, words):
+        return " ".join(self.random.choices(WORDS, k=words)).capitalize()
+
+    def bulk_create(self, model, objects):
+        model.objects.bulk_create(objects, self.batch_size)
+
+    def create_catalog(self, model, slugs):
+        existing = set(
+            model.objects.filter(slug__in=slugs).values_list("slug", flat=True)
+        )
+        self.bulk_create(
+            model,
+            [
+                model(name=slug.capitalize(), slug=slug)
+                for slug in slugs
+                if slug not in existing
+            ],
+        )
+        return list(
+            model.objects.filter(slug__in=slugs).values_list("pk", flat=True)
+        )
+
+    def create_users(self, count):
+        first_id = next_id(User)
+        ids = range(first_id, first_id + count)
+        # No admins: whoever reads the database could obtain their tokens.
+        roles = self.random.choices(
+            (Role.USER, Role.MODERATOR), (92, 8), k=count
+        )
+        self.bulk_create(
+            User,
+            [
+                User(
+                    id=pk,
+                    username=f"{USERNAME_PREFIX}{pk}",
+                    email=f"{USERNAME_PREFIX}{pk}@yamdb.fake",
+                    role=role,
+                    confirmation_code=User.objects.make_random_password(
+                        length=12
+                    ),
+                )
+                for pk, role in zip(ids, roles)
+            ],
+        )
+        return list(ids)
+
+    def create_titles(self, count, category_ids, genre_ids, max_genres):
+        first_id = next_id(Title)
+        ids = range(first_id, first_id + count)
+        self.bulk_create(
+            Title,
+            [
+                Title(
+                    id=pk,
+                    name=f"{self.text(2)} {pk}",
+                    year=self.random.randint(1920, 2022),
+                    description=self.text(30),
+                    category_id=self.random.choice(category_ids),
+                )
+                for pk in ids
+            ],
+        )
+        self.bulk_create(
+            GenreTitle,
+            [
+                GenreTitle(title_id=pk, genre_id=genre_id)
+                for pk in ids
+                for genre_id in self.random.sample(
+                    genre_ids, self.random.randint(1, max_genres)
+                )
+            ],
+        )
+        return list(ids)
+
+    def create_reviews(self, title_ids, user_ids, counts):
+        pk = next_id(Review)
+        ids = []
+        batch = []
+        for title_id, count in zip(title_ids, counts):
+            for author_id in self.random.sample(user_ids, count):
+                batch.append(
+                    Review(
+                        id=pk,
+                        title_id=title_id,
+                        author_id=author_id,
+                        text=self.text(self.random.randint(5, 60)),
+                        score=min(10, max(1, round(self.random.gauss(7, 2)))),
+                    )
+                )
+                ids.append(pk)
+                pk += 1
+            if len(batch) >= self.batch_size:
+                self.bulk_create(Review, batch)
+                batch = []
+        self.bulk_create(Review, batch)
+        return ids
+
+    def create_comments(self, review_ids, user_ids, mean):
+        if mean <= 0:
+            return
+        batch = []
+        for review_id in review_ids:
+            for _ in range(round(self.random.expovariate(1 / mean))):
+                batch.append(
+                    Comment(
+                        review_id=review_id,
+                        author_id=self.random.choice(user_ids),
+                        text=self.text(self.random.randint(3, 25)),
+                    )
+                )
+            if len(batch) >= self.batch_size:
+                self.bulk_create(Comment, batch)
+                batch = []
+        self.bulk_create(Comment, batch)
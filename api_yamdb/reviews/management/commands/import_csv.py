@@ -0,0 +1,231 @@
+import csv
+import json
+import os
+import time
+from contextlib import contextmanager
+from itertools import islice
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from api.cache import response_cache
+from reviews.models import Category, Comment, Genre, GenreTitle, Review, Title
+from users.models import User
+
+DEFAULT_PATH = os.path.join(settings.BASE_DIR, "static", "data")
+
+
+@contextmanager
+def explicit_timestamps(model):
+    """Let bulk_create keep the given pub_date/updated values."""
+    fields = [
+        field
+        for field in model._meta.concrete_fields
+        if getattr(field, "auto_now", False)
+        or getattr(field, "auto_now_add", False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now = auto_now
+            field.auto_now_add = auto_now_add
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream the YaMDb CSV dumps into the database in batches. Source ids "
+        "are kept as primary keys, so an interrupted import can be resumed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--path", default=DEFAULT_PATH)
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--checkpoint",
+            help="JSON file recording imported rows per CSV file.",
+        )
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Ignore an existing checkpoint and start from scratch.",
+        )
+
+    def get_sources(self):
+        return (
+            ("users.csv", User, self.build_user),
+            ("category.csv", Category, self.build_category),
+            ("genre.csv", Genre, self.build_genre),
+            ("titles.csv", Title, self.build_title),
+            ("genre_title.csv", GenreTitle, self.build_genre_title),
+            ("review.csv", Review, self.build_review),
+            ("comments.csv", Comment, self.build_comment),
+        )
+
+    def handle(self, *args, **options):
+        self.verbosity = options["verbosity"]
+        self.batch_size = options["batch_size"]
+        self.checkpoint_path = options["checkpoint"]
+        self.checkpoint = {}
+        if self.checkpoint_path and not options["reset"]:
+            self.checkpoint = self.load_checkpoint()
+        self.known_ids = {}
+        self.now = timezone.now()
+
+        for filename, model, build in self.get_sources():
+            path = os.path.join(options["path"], filename)
+            if not os.path.exists(path):
+                raise CommandError(f"File {path} not found")
+            with explicit_timestamps(model):
+                self.import_file(path, filename, model, build)
+
+        Title.objects.rebuild_ratings()
+        response_cache.invalidate("categories", "genres", "titles")
+        self.stdout.write(self.style.SUCCESS("Import finished"))
+
+    def import_file(self, path, filename, model, build):
+        done = self.checkpoint.get(filename, 0)
+        imported = skipped = conflicts = 0
+        started = time.monotonic()
+        with open(path, encoding="utf-8", newline="") as source:
+            rows = islice(csv.DictReader(source), done, None)
+            while True:
+                chunk = list(islice(rows, self.batch_size))
+                if not chunk:
+                    break
+                objects = [
+                    obj for obj in map(build, chunk) if obj is not None
+                ]
+                skipped += len(chunk) - len(objects)
+                # Rows of a resumed batch may already be in the database.
+                known_ids = self.get_known_ids(model)
+                objects = [obj for obj in objects if obj.pk not in known_ids]
+                with transaction.atomic():
+                    model.objects.bulk_create(
+                        objects, self.batch_size, ignore_conflicts=True
+                    )
+                # Rows clashing with a unique field, like a taken username
+                # or slug, are dropped by ignore_conflicts and must not be
+                # referenced by the rows depending on them.
+                inserted = set(
+                    model.objects.filter(
+                        pk__in=[obj.pk for obj in objects]
+                    ).values_list("pk", flat=True)
+                )
+                known_ids.update(inserted)
+                done += len(chunk)
+                imported += len(inserted)
+                conflicts += len(objects) - len(inserted)
+                self.save_checkpoint(filename, done)
+                if self.verbosity > 1:
+                    self.stdout.write(f"{filename}: {done} rows")
+
+        elapsed = time.monotonic() - started
+        rate = imported / elapsed if elapsed else 0
+        self.stdout.write(
+            f"{filename}: imported {imported}, skipped {skipped}, "
+            f"conflicting {conflicts} rows in {elapsed:.2f}s "
+            f"({rate:.0f} rows/s)"
+        )
+
+    def get_known_ids(self, model):
+        if model not in self.known_ids:
+            self.known_ids[model] = set(
+                model.objects.values_list("pk", flat=True)
+            )
+        return self.known_ids[model]
+
+    def resolve(self, model, value):
+        if value and int(value) in self.get_known_ids(model):
+            return int(value)
+        return None
+
+    def load_checkpoint(self):
+        if not os.path.exists(self.checkpoint_path):
+            return {}
+        with open(self.checkpoint_path, encoding="utf-8") as file:
+            return json.load(file)
+
+    def save_checkpoint(self, filename, done):
+        if not self.checkpoint_path:
+            return
+        self.checkpoint[filename] = done
+        temporary = f"{self.checkpoint_path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump(self.checkpoint, file)
+        os.replace(temporary, self.checkpoint_path)
+
+    def build_user(self, row):
+        return User(
+            id=int(row["id"]),
+            username=row["username"],
+            email=row["email"],
+            role=row["role"] or User._meta.get_field("role").default,
+            bio=row["bio"],
+            first_name=row["first_name"],
+            last_name=row["last_name"],
+            confirmation_code=User.objects.make_random_password(length=12),
+            date_joined=self.now,
+        )
+
+    def build_category(self, row):
+        return Category(id=int(row["id"]), name=row["name"], slug=row["slug"])
+
+    def build_genre(self, row):
+        return Genre(id=int(row["id"]), name=row["name"], slug=row["slug"])
+
+    def build_title(self, row):
+        return Title(
+            id=int(row["id"]),
+            name=row["name"],
+            year=int(row["year"]),
+            description=row.get("description") or None,
+            category_id=self.resolve(Category, row["category"]),
+            updated=self.now,
+        )
+
+    def build_genre_title(self, row):
+        title_id = self.resolve(Title, row["title_id"])
+        genre_id = self.resolve(Genre, row["genre_id"])
+        if title_id is None or genre_id is None:
+            return None
+        return GenreTitle(
+            id=int(row["id"]), title_id=title_id, genre_id=genre_id
+        )
+
+    def build_review(self, row):
+        title_id = self.resolve(Title, row["title_id"])
+        author_id = self.resolve(User, row["author"])
+        if title_id is None or author_id is None:
+            return None
+        pub_date = parse_datetime(row["pub_date"])
+        return Review(
+            id=int(row["id"]),
+            title_id=title_id,
+            author_id=author_id,
+            text=row["text"],
+            score=int(row["score"]),
+            pub_date=pub_date,
+            updated=pub_date,
+        )
+
+    def build_comment(self, row):
+        review_id = self.resolve(Review, row["review_id"])
+        author_id = self.resolve(User, row["author"])
+        if review_id is None or author_id is None:
+            return None
+        pub_date = parse_datetime(row["pub_date"])
+        return Comment(
+            id=int(row["id"]),
+            review_id=review_id,
+            author_id=author_id,
+            text=row["text"],
+            pub_date=pub_date,
+            updated=pub_date,
+        )
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.models import Title
+
+
+class Command(BaseCommand):
+    help = "Пересчитывает рейтинги и лидерборды произведений по всем отзывам."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            updated = Title.objects.rebuild_ratings()
+        self.stdout.write(
+            self.style.SUCCESS(f"Пересчитаны рейтинги: {updated}")
+        )
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from reviews.models import Review, Title
+
+
+class Command(BaseCommand):
+    help = "Rebuild the SQLite FTS5 indexes for titles and reviews."
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            raise CommandError("Full-text indexes exist only on SQLite.")
+        with connection.cursor() as cursor:
+            for model in (Title, Review):
+                index = f"{model._meta.db_table}_fts"
+                cursor.execute(
+                    f"INSERT INTO {index}({index}) VALUES ('rebuild')"
+                )
+                self.stdout.write(f"Rebuilt {index}")
+        self.stdout.write(self.style.SUCCESS("Search indexes rebuilt"))
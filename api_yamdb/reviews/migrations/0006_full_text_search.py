@@ -0,0 +1,64 @@
+from django.db import migrations
+
+SEARCH_INDEXES = {
+    'reviews_title': ('name', 'description'),
+    'reviews_review': ('text',),
+}
+
+
+def create_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for table, columns in SEARCH_INDEXES.items():
+        index = f'{table}_fts'
+        names = ', '.join(columns)
+        new = ', '.join(f'new.{column}' for column in columns)
+        old = ', '.join(f'old.{column}' for column in columns)
+        insert = (
+            f'INSERT INTO {index}(rowid, {names}) VALUES (new.id, {new});'
+        )
+        delete = (
+            f'INSERT INTO {index}({index}, rowid, {names}) '
+            f"VALUES ('delete', old.id, {old});"
+        )
+        schema_editor.execute(
+            f'CREATE VIRTUAL TABLE {index} USING fts5({names}, '
+            f"content='{table}', content_rowid='id', "
+            "tokenize='unicode61 remove_diacritics 2')"
+        )
+        schema_editor.execute(
+            f'CREATE TRIGGER {index}_ai AFTER INSERT ON {table} '
+            f'BEGIN {insert} END'
+        )
+        schema_editor.execute(
+            f'CREATE TRIGGER {index}_ad AFTER DELETE ON {table} '
+            f'BEGIN {delete} END'
+        )
+        schema_editor.execute(
+            f'CREATE TRIGGER {index}_au AFTER UPDATE OF {names} ON {table} '
+            f'BEGIN {delete} {insert} END'
+        )
+        schema_editor.execute(
+            f"INSERT INTO {index}({index}) VALUES ('rebuild')"
+        )
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for table in SEARCH_INDEXES:
+        index = f'{table}_fts'
+        for suffix in ('ai', 'ad', 'au'):
+            schema_editor.execute(f'DROP TRIGGER IF EXISTS {index}_{suffix}')
+        schema_editor.execute(f'DROP TABLE IF EXISTS {index}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0005_updated'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -0,0 +1,76 @@
+# Generated by Django 3.2 on 2026-10-18 20:36
+
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_leaderboards(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    GenreTitle = apps.get_model('reviews', 'GenreTitle')
+    LeaderboardEntry = apps.get_model('reviews', 'LeaderboardEntry')
+    weight = settings.LEADERBOARD_MIN_REVIEWS
+    genres = defaultdict(list)
+    for title_id, genre_id in GenreTitle.objects.values_list(
+        'title_id', 'genre_id'
+    ):
+        genres[title_id].append(genre_id)
+    entries = []
+    for title_id, title_category_id, rating_sum, rating_count in (
+        Title.objects.values_list(
+            'pk', 'category_id', 'rating_sum', 'rating_count'
+        ).iterator()
+    ):
+        score = None
+        if rating_count >= max(weight, 1):
+            score = (
+                rating_sum + weight * settings.LEADERBOARD_PRIOR_MEAN
+            ) / (rating_count + weight)
+        for category_id in {None, title_category_id}:
+            for genre_id in (None, *genres[title_id]):
+                entries.append(LeaderboardEntry(
+                    title_id=title_id,
+                    category_id=category_id,
+                    genre_id=genre_id,
+                    rating_sum=rating_sum,
+                    rating_count=rating_count,
+                    score=score,
+                ))
+    LeaderboardEntry.objects.bulk_create(entries, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_full_text_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaderboardEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rating_sum', models.PositiveIntegerField(default=0, verbose_name='Сумма оценок')),
+                ('rating_count', models.PositiveIntegerField(default=0, verbose_name='Количество оценок')),
+                ('score', models.FloatField(blank=True, null=True, verbose_name='Байесовский рейтинг')),
+                ('category', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='reviews.category', verbose_name='Категория')),
+                ('genre', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='reviews.genre', verbose_name='Жанр')),
+                ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_entries', to='reviews.title', verbose_name='Произведение')),
+            ],
+            options={
+                'verbose_name': 'Позиция в рейтинге',
+                'verbose_name_plural': 'Позиции в рейтинге',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='leaderboardentry',
+            index=models.Index(fields=['category', 'genre', '-score', 'title'], name='leaderboard_score_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='leaderboardentry',
+            index=models.Index(fields=['category', 'genre', '-rating_count', 'title'], name='leaderboard_count_idx'),
+        ),
+        migrations.RunPython(fill_leaderboards, migrations.RunPython.noop),
+    ]
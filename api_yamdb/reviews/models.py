@@ -1,8 +1,17 @@
+from collections import defaultdict
+from itertools import islice
+
+from django.conf import settings
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
+from django.db.models import (Avg, Case, CharField, Count, F, FloatField,
+                              OuterRef, Subquery, Sum, Value, When)
+from django.db.models.functions import Cast, Coalesce
+from django.utils import timezone
 
 from users.models import User
 
+from .search import full_text_search
 from .validators import validate_title_year
 
 
@@ -21,6 +30,9 @@ class Category(models.Model):
     class Meta:
         verbose_name = "Категория"
         ordering = ("name",)
+        indexes = (
+            models.Index(fields=("name", "id"), name="category_name_id_idx"),
+        )
 
     def __str__(self):
         return self.name
@@ -39,11 +51,115 @@ class Genre(models.Model):
     class Meta:
         verbose_name = "Жанр"
         ordering = ("name",)
+        indexes = (
+            models.Index(fields=("name", "id"), name="genre_name_id_idx"),
+        )
 
     def __str__(self):
         return self.name
 
 
+class TitleQuerySet(models.QuerySet):
+    def update_rating(self, score_delta, count_delta):
+        LeaderboardEntry.objects.filter(title__in=self).update_rating(
+            score_delta, count_delta
+        )
+        rating_sum = F("rating_sum") + score_delta
+        rating_count = F("rating_count") + count_delta
+        return self.update(
+            updated=timezone.now(),
+            rating_sum=rating_sum,
+            rating_count=rating_count,
+            rating=Case(
+                When(
+                    rating_count__gt=-count_delta,
+                    then=Cast(rating_sum, FloatField()) / rating_count,
+                ),
+                default=None,
+                output_field=FloatField(),
+            ),
+        )
+
+    def search(self, text):
+        return full_text_search(
+            self, text, weights={"name": 10.0, "description": 1.0}
+        )
+
+    def touch(self):
+        return self.update(updated=timezone.now())
+
+    def facet_counts(self, *names):
+        """Count the titles per genre, category and/or year in one query.
+
+        Each facet is a GROUP BY over this queryset itself rather than over
+        a subquery of its ids, since the full-text search filter refers to
+        the title table by name. Counts are distinct because filters may
+        join genres.
+        """
+        titles = self.order_by()
+        text = CharField()
+        sources = {
+            "genre": titles.values(
+                facet=Value("genre", output_field=text),
+                value=F("genre__slug"),
+                label=F("genre__name"),
+            ),
+            "category": titles.values(
+                facet=Value("category", output_field=text),
+                value=F("category__slug"),
+                label=F("category__name"),
+            ),
+            "year": titles.values(
+                facet=Value("year", output_field=text),
+                value=F("year"),
+                label=Value(None, output_field=text),
+            ),
+        }
+        first, *rest = (
+            sources[name].annotate(count=Count("pk", distinct=True))
+            for name in names
+        )
+        facets = {name: [] for name in names}
+        for row in first.union(*rest, all=True):
+            if row["value"] is None:
+                continue
+            if row["facet"] == "year":
+                bucket = {"year": int(row["value"]), "count": row["count"]}
+            else:
+                bucket = {
+                    "slug": row["value"],
+                    "name": row["label"],
+                    "count": row["count"],
+                }
+            facets[row["facet"]].append(bucket)
+        for name, buckets in facets.items():
+            key = "year" if name == "year" else "slug"
+            buckets.sort(key=lambda bucket: (-bucket["count"], bucket[key]))
+        return facets
+
+    def rebuild_ratings(self):
+        reviews = (
+            Review.objects.filter(title=OuterRef("pk"))
+            .order_by()
+            .values("title")
+        )
+        updated = self.update(
+            rating_sum=Coalesce(
+                Subquery(reviews.annotate(total=Sum("score")).values("total")),
+                0,
+            ),
+            rating_count=Coalesce(
+                Subquery(reviews.annotate(total=Count("pk")).values("total")),
+                0,
+            ),
+            rating=Subquery(
+                reviews.annotate(avg=Avg("score")).values("avg")
+            ),
+        )
+        LeaderboardEntry.objects.rebuild(self)
+        return updated
+
+
 class Title(models.Model):
     name = models.CharField(
         max_length=256, verbose_name="Название", db_index=True
@@ -62,23 +178,57 @@ class Title(models.Model):
         verbose_name="Категория",
         default=None,
     )
+    rating_sum = models.PositiveIntegerField(
+        default=0, verbose_name="Сумма оценок"
+    )
+    rating_count = models.PositiveIntegerField(
+        default=0, verbose_name="Количество оценок"
+    )
+    rating = models.FloatField(
+        null=True, blank=True, db_index=True, verbose_name="Рейтинг"
+    )
+    updated = models.DateTimeField(auto_now=True, verbose_name="Изменено")
+
+    objects = TitleQuerySet.as_manager()
 
     class Meta:
         verbose_name = "Произведение"
         ordering = ("name",)
+        indexes = (
+            models.Index(fields=("name", "id"), name="title_name_id_idx"),
+            models.Index(fields=("updated",), name="title_updated_idx"),
+        )
 
     def __str__(self):
         return self.name
 
 
 class GenreTitle(models.Model):
-    genre = models.ForeignKey(Genre, on_delete=models.CASCADE)
+    genre = models.ForeignKey(Genre, on_delete=models.CASCADE, db_index=False)
     title = models.ForeignKey(
         Title,
         on_delete=models.CASCADE,
         verbose_name="Жанр",
+        db_index=False,
     )
 
+    class Meta:
+        indexes = (
+            models.Index(
+                fields=("genre", "title"), name="genretitle_genre_title_idx"
+            ),
+        )
+        constraints = [
+            models.UniqueConstraint(
+                fields=["title", "genre"], name="unique_genre_title"
+            )
+        ]
+
+
+class ReviewQuerySet(models.QuerySet):
+    def search(self, text):
+        return full_text_search(self, text, weights={"text": 1.0})
+
 
 class Review(models.Model):
     author = models.ForeignKey(
@@ -102,11 +252,20 @@ class Review(models.Model):
     pub_date = models.DateTimeField(
         auto_now_add=True, verbose_name="Дата публикации"
     )
+    updated = models.DateTimeField(auto_now=True, verbose_name="Изменено")
+
+    objects = ReviewQuerySet.as_manager()
 
     class Meta:
         verbose_name = "Отзыв"
         verbose_name_plural = "Отзывы"
         ordering = ("pub_date",)
+        indexes = (
+            models.Index(
+                fields=("title", "pub_date", "id"),
+                name="review_title_pub_date_idx",
+            ),
+        )
         constraints = [
             models.UniqueConstraint(
                 fields=["title", "author"], name="unique_review"
@@ -116,6 +275,21 @@ class Review(models.Model):
     def __str__(self):
         return self.text
 
+    def save(self, *args, **kwargs):
+        # Together with the rating update of the post_save signal.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # The title and score the stored rating counters include, so that
+        # saving the review can apply the difference.
+        loaded = dict(zip(field_names, values))
+        if "title_id" in loaded and "score" in loaded:
+            instance._rated = (loaded["title_id"], loaded["score"])
+        return instance
+
 
 class Comment(models.Model):
     author = models.ForeignKey(
@@ -134,10 +308,185 @@ class Comment(models.Model):
     pub_date = models.DateTimeField(
         auto_now_add=True, verbose_name="Дата публикации комментария"
     )
+    updated = models.DateTimeField(auto_now=True, verbose_name="Изменено")
 
     class Meta:
         verbose_name = "Комментарий"
         ordering = ("-pub_date",)
+        indexes = (
+            models.Index(
+                fields=("review", "pub_date", "id"),
+                name="comment_review_pub_date_idx",
+            ),
+        )
 
     def __str__(self):
         return self.text
+
+
+class LeaderboardQuerySet(models.QuerySet):
+    def update_rating(self, score_delta, count_delta):
+        weight = settings.LEADERBOARD_MIN_REVIEWS
+        rating_sum = F("rating_sum") + score_delta
+        rating_count = F("rating_count") + count_delta
+        return self.update(
+            rating_sum=rating_sum,
+            rating_count=rating_count,
+            score=Case(
+                When(
+                    rating_count__gte=max(weight, 1) - count_delta,
+                    then=(
+                        Cast(rating_sum, FloatField())
+                        + weight * settings.LEADERBOARD_PRIOR_MEAN
+                    ) / (rating_count + weight),
+                ),
+                default=None,
+                output_field=FloatField(),
+            ),
+        )
+
+    @transaction.atomic
+    def rebuild(self, titles, batch_size=1000):
+        """Recreate the entries of `titles` from their rating counters."""
+        titles = titles.order_by()
+        self.filter(title__in=titles).delete()
+        genres = defaultdict(list)
+        for title_id, genre_id in GenreTitle.objects.filter(
+            title__in=titles
+        ).values_list("title_id", "genre_id"):
+            genres[title_id].append(genre_id)
+
+        entries = (
+            self.model(
+                title_id=title_id,
+                category_id=category_id,
+                genre_id=genre_id,
+                rating_sum=rating_sum,
+                rating_count=rating_count,
+            )
+            for title_id, title_category_id, rating_sum, rating_count
+            in titles.values_list(
+                "pk", "category_id", "rating_sum", "rating_count"
+            ).iterator()
+            for category_id in {None, title_category_id}
+            for genre_id in (None, *genres[title_id])
+        )
+        while True:
+            batch = list(islice(entries, batch_size))
+            if not batch:
+                break
+            self.bulk_create(batch)
+        self.filter(title__in=titles).update_rating(0, 0)
+
+
+class LeaderboardEntry(models.Model):
+    """A title ranked within one category/genre scope, None meaning any."""
+
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name="leaderboard_entries",
+        verbose_name="Произведение",
+    )
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.CASCADE,
+        null=True,
+        related_name="+",
+        verbose_name="Категория",
+    )
+    genre = models.ForeignKey(
+        Genre,
+        on_delete=models.CASCADE,
+        null=True,
+        related_name="+",
+        verbose_name="Жанр",
+    )
+    rating_sum = models.PositiveIntegerField(
+        default=0, verbose_name="Сумма оценок"
+    )
+    rating_count = models.PositiveIntegerField(
+        default=0, verbose_name="Количество оценок"
+    )
+    score = models.FloatField(
+        null=True, blank=True, verbose_name="Байесовский рейтинг"
+    )
+
+    objects = LeaderboardQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = "Позиция в рейтинге"
+        verbose_name_plural = "Позиции в рейтинге"
+        indexes = (
+            models.Index(
+                fields=("category", "genre", "-score", "title"),
+                name="leaderboard_score_idx",
+            ),
+            models.Index(
+                fields=("category", "genre", "-rating_count", "title"),
+                name="leaderboard_count_idx",
+            ),
+        )
+
+
+class TitleSimilarityQuerySet(models.QuerySet):
+    def recommend(self, user, limit):
+        """Predict scores of unseen titles from the user's own reviews.
+
+        Returns (title_id, score) pairs, best first. The prediction is the
+        user's mean score plus the similarity-weighted deviations from it on
+        the neighbours the user has reviewed.
+        """
+        ratings = dict(
+            Review.objects.filter(author=user)
+            .order_by()
+            .values_list("title_id", "score")
+        )
+        if not ratings:
+            return []
+        mean = sum(ratings.values()) / len(ratings)
+        deviations = defaultdict(float)
+        weights = defaultdict(float)
+        neighbours = (
+            self.filter(title__reviews__author=user)
+            .exclude(similar__reviews__author=user)
+            .values_list("title_id", "similar_id", "score")
+        )
+        for title_id, similar_id, score in neighbours:
+            deviations[similar_id] += score * (ratings[title_id] - mean)
+            weights[similar_id] += score
+        predictions = {
+            title_id: mean + deviations[title_id] / weight
+            for title_id, weight in weights.items()
+        }
+        return sorted(
+            predictions.items(),
+            key=lambda item: (-item[1], -weights[item[0]], item[0]),
+        )[:limit]
+
+
+class TitleSimilarity(models.Model):
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name="similarities",
+        verbose_name="Произведение",
+    )
+    similar = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name="+",
+        verbose_name="Похожее произведение",
+    )
+    score = models.FloatField(verbose_name="Сходство")
+
+    objects = TitleSimilarityQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = "Похожее произведение"
+        verbose_name_plural = "Похожие произведения"
+        indexes = (
+            models.Index(
+                fields=("title", "-score"), name="similarity_title_score_idx"
+            ),
+        )
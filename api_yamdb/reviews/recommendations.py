@@ -0,0 +1,68 @@
+import numpy as np
+from scipy import sparse
+
+REVIEW_DTYPE = [
+    ("author", np.int64),
+    ("title", np.int64),
+    ("score", np.float64),
+]
+
+
+def top_k(rows, cols, values, k):
+    """Keep the `k` largest positive values of every row of a COO matrix."""
+    positive = values > 0
+    rows, cols, values = rows[positive], cols[positive], values[positive]
+    order = np.lexsort((cols, -values, rows))
+    rows, cols, values = rows[order], cols[order], values[order]
+    starts = np.searchsorted(rows, rows)
+    keep = np.arange(rows.size) - starts < k
+    return rows[keep], cols[keep], values[keep]
+
+
+def item_similarities(reviews, neighbours=20, shrinkage=10, block_size=1000):
+    """Yield (title_ids, similar_ids, similarities) for blocks of titles.
+
+    `reviews` is a structured array of REVIEW_DTYPE. Similarity is the
+    adjusted cosine: scores are centered on each author's mean and titles
+    are compared as vectors over authors. It is shrunk by
+    common / (common + shrinkage), where `common` counts the authors who
+    reviewed both titles, so that a couple of shared reviews do not make two
+    titles look identical. Only the top `neighbours` of every title are kept,
+    and the title x title matrix is built `block_size` rows at a time.
+    """
+    author_ids, authors = np.unique(reviews["author"], return_inverse=True)
+    title_ids, titles = np.unique(reviews["title"], return_inverse=True)
+    scores = reviews["score"]
+    means = np.bincount(authors, weights=scores) / np.bincount(authors)
+    shape = (author_ids.size, title_ids.size)
+
+    ratings = sparse.csc_matrix(
+        (scores - means[authors], (authors, titles)), shape=shape
+    )
+    norms = np.sqrt(np.asarray(ratings.multiply(ratings).sum(axis=0)))
+    norms = norms.ravel()
+    norms[norms == 0] = 1
+    ratings = (ratings @ sparse.diags(1 / norms)).tocsr()
+    rated = sparse.csr_matrix(
+        (np.ones(scores.size), (authors, titles)), shape=shape
+    )
+    ratings_t = ratings.T.tocsr()
+    rated_t = rated.T.tocsr()
+
+    for start in range(0, title_ids.size, block_size):
+        block = slice(start, start + block_size)
+        similarities = (ratings_t[block] @ ratings).tocsr()
+        if shrinkage:
+            common = (rated_t[block] @ rated).tocsr()
+            common.data /= common.data + shrinkage
+            similarities = similarities.multiply(common)
+        similarities = similarities.tocoo()
+        rows = similarities.row + start
+        others = rows != similarities.col
+        rows, cols, values = top_k(
+            rows[others],
+            similarities.col[others],
+            similarities.data[others],
+            neighbours,
+        )
+        yield title_ids[rows], title_ids[cols], values
@@ -0,0 +1,71 @@
+import re
+from html import escape
+
+from django.db import connection
+from django.db.models import FloatField, Q, TextField
+from django.db.models.expressions import RawSQL
+
+SNIPPET_TOKENS = 12
+# Control characters marking the matches in snippets until the text around
+# them has been escaped.
+MATCH_START = "\x02"
+MATCH_END = "\x03"
+
+
+def to_match_expression(text):
+    """Turn free user input into a safe FTS5 prefix query."""
+    return " ".join(f'"{token}"*' for token in re.findall(r"\w+", text))
+
+
+def full_text_search(queryset, text, weights):
+    """Filter `queryset` by the FTS5 index of its table, best matches first.
+
+    `weights` maps every indexed column to its bm25 weight. Other database
+    backends fall back to case-insensitive substring matching.
+    """
+    expression = to_match_expression(text)
+    if not expression:
+        return queryset.none()
+    if connection.vendor != "sqlite":
+        condition = Q()
+        for column in weights:
+            condition |= Q(**{f"{column}__icontains": text})
+        return queryset.filter(condition)
+
+    table = queryset.model._meta.db_table
+    index = f"{table}_fts"
+    bm25_weights = ", ".join(str(weight) for weight in weights.values())
+    # bm25() and snippet() only work in a query on the index, hence a
+    # correlated subquery per row; FTS5 looks the row up by rowid.
+    match = f"FROM {index} WHERE {index} MATCH %s AND rowid = {table}.id"
+    return (
+        queryset.filter(
+            pk__in=RawSQL(
+                f"SELECT rowid FROM {index} WHERE {index} MATCH %s",
+                (expression,),
+            )
+        )
+        .annotate(
+            search_rank=RawSQL(
+                f"SELECT bm25({index}, {bm25_weights}) {match}",
+                (expression,),
+                output_field=FloatField(),
+            ),
+            search_snippet=RawSQL(
+                f"SELECT snippet({index}, -1, '{MATCH_START}', "
+                f"'{MATCH_END}', '…', {SNIPPET_TOKENS}) {match}",
+                (expression,),
+                output_field=TextField(),
+            ),
+        )
+        .order_by("search_rank")
+    )
+
+
+def highlight(snippet):
+    """Escape a search snippet for HTML and wrap its matches in <b> tags."""
+    return (
+        escape(snippet)
+        .replace(MATCH_START, "<b>")
+        .replace(MATCH_END, "</b>")
+    )
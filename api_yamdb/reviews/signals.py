@@ -0,0 +1,102 @@
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_delete, pre_save)
+from django.dispatch import receiver
+
+from core.transactions import collect_on_commit
+
+from .models import GenreTitle, LeaderboardEntry, Review, Title
+
+
+def rebuild_leaderboards(title_ids):
+    # After commit, so that a cascading title delete has finished and the
+    # title is simply left out of the rebuild.
+    transaction.on_commit(
+        lambda: LeaderboardEntry.objects.rebuild(
+            Title.objects.filter(pk__in=title_ids)
+        )
+    )
+
+
+@receiver(post_save, sender=Title)
+def title_saved(sender, instance, **kwargs):
+    rebuild_leaderboards([instance.pk])
+
+
+@receiver(post_save, sender=GenreTitle)
+@receiver(post_delete, sender=GenreTitle)
+def genre_title_changed(sender, instance, **kwargs):
+    rebuild_leaderboards([instance.title_id])
+
+
+@receiver(m2m_changed, sender=GenreTitle)
+def title_genres_changed(sender, instance, action, reverse, pk_set,
+                         **kwargs):
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            rebuild_leaderboards([instance.pk])
+    elif action == "pre_clear":
+        rebuild_leaderboards(
+            list(instance.title_set.values_list("pk", flat=True))
+        )
+    elif action in ("post_add", "post_remove"):
+        rebuild_leaderboards(list(pk_set))
+
+
+def update_rating(title_id, score_delta, count_delta):
+    Title.objects.filter(pk=title_id).update_rating(score_delta, count_delta)
+
+
+@receiver(pre_save, sender=Review)
+def review_saving(sender, instance, raw, **kwargs):
+    if raw or instance._state.adding or hasattr(instance, "_rated"):
+        return
+    instance._rated = (
+        Review.objects.filter(pk=instance.pk)
+        .values_list("title_id", "score")
+        .first()
+    )
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, raw, **kwargs):
+    if raw:
+        return
+    rated = None if created else getattr(instance, "_rated", None)
+    if rated is None:
+        update_rating(instance.title_id, instance.score, 1)
+    elif rated[0] != instance.title_id:
+        update_rating(rated[0], -rated[1], -1)
+        update_rating(instance.title_id, instance.score, 1)
+    elif rated[1] != instance.score:
+        update_rating(instance.title_id, instance.score - rated[1], 0)
+    instance._rated = (instance.title_id, instance.score)
+
+
+def apply_deleted_ratings(items):
+    deleted_titles = {title_id for title_id, score in items if score is None}
+    deltas = defaultdict(lambda: [0, 0])
+    for title_id, score in items:
+        if score is not None and title_id not in deleted_titles:
+            deltas[title_id][0] -= score
+            deltas[title_id][1] -= 1
+    for title_id, (score_delta, count_delta) in deltas.items():
+        update_rating(title_id, score_delta, count_delta)
+
+
+# Collected before the delete, while a deferred score can still be loaded,
+# and applied once per title on commit. This also covers reviews deleted by
+# a cascade from their title or author; titles deleted in the same
+# transaction are skipped.
+@receiver(pre_delete, sender=Review)
+def review_deleting(sender, instance, **kwargs):
+    collect_on_commit(
+        apply_deleted_ratings, (instance.title_id, instance.score)
+    )
+
+
+@receiver(pre_delete, sender=Title)
+def title_deleting(sender, instance, **kwargs):
+    collect_on_commit(apply_deleted_ratings, (instance.pk, None))
@@ -0,0 +1,158 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.core.mail import EmailMessage, get_connection
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from users.models import OutgoingEmail
+
+LEASE = timedelta(minutes=5)
+MAX_BACKOFF = timedelta(hours=1)
+
+
+class Command(BaseCommand):
+    help = "Send queued emails from the outbox."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument(
+            "--connections",
+            type=int,
+            default=2,
+            help="Number of SMTP connections sending batches in parallel.",
+        )
+        parser.add_argument("--max-attempts", type=int, default=5)
+        parser.add_argument(
+            "--backoff",
+            type=float,
+            default=30,
+            help="Base retry delay in seconds, doubled after each failure.",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep polling the outbox instead of exiting when empty.",
+        )
+        parser.add_argument("--interval", type=float, default=5)
+
+    def handle(self, *args, **options):
+        self.options = options
+        self.local = threading.local()
+        self.connections = []
+        self.connections_lock = threading.Lock()
+        total_sent = total_failed = 0
+        try:
+            with ThreadPoolExecutor(options["connections"]) as pool:
+                while True:
+                    sent, failed = self.drain(pool)
+                    total_sent += sent
+                    total_failed += failed
+                    if sent or failed:
+                        continue
+                    if not options["loop"]:
+                        break
+                    time.sleep(options["interval"])
+        finally:
+            for connection in self.connections:
+                connection.close()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Sent {total_sent} emails, {total_failed} failed"
+            )
+        )
+
+    def claim(self, limit):
+        with transaction.atomic():
+            emails = list(
+                OutgoingEmail.objects.due(self.options["max_attempts"])
+                .select_for_update(skip_locked=True)[:limit]
+            )
+            OutgoingEmail.objects.filter(
+                pk__in=[email.pk for email in emails]
+            ).update(next_attempt_at=timezone.now() + LEASE)
+        return emails
+
+    def get_connection(self):
+        connection = getattr(self.local, "connection", None)
+        if connection is None:
+            connection = get_connection()
+            connection.open()
+            self.local.connection = connection
+            with self.connections_lock:
+                self.connections.append(connection)
+        return connection
+
+    def close_connection(self):
+        connection = getattr(self.local, "connection", None)
+        self.local.connection = None
+        if connection is not None:
+            try:
+                connection.close()
+            except Exception:
+                pass
+
+    def send_batch(self, emails):
+        """Send the emails one by one, returning an error or None for each.
+
+        A failed message closes the connection, the next one opens a new
+        one; if that fails the rest of the batch fails with the same error.
+        """
+        results = []
+        for email in emails:
+            try:
+                connection = self.get_connection()
+            except Exception as error:
+                self.close_connection()
+                return results + [error] * (len(emails) - len(results))
+            message = EmailMessage(
+                email.subject,
+                email.body,
+                email.from_email,
+                [email.recipient],
+                connection=connection,
+            )
+            try:
+                connection.send_messages([message])
+            except Exception as error:
+                self.close_connection()
+                results.append(error)
+            else:
+                results.append(None)
+        return results
+
+    def drain(self, pool):
+        batch_size = self.options["batch_size"]
+        emails = self.claim(batch_size * self.options["connections"])
+        batches = [
+            emails[start:start + batch_size]
+            for start in range(0, len(emails), batch_size)
+        ]
+        sent_pks = []
+        failed = 0
+        for batch, errors in zip(batches, pool.map(self.send_batch, batches)):
+            for email, error in zip(batch, errors):
+                if error is None:
+                    sent_pks.append(email.pk)
+                    continue
+                OutgoingEmail.objects.filter(pk=email.pk).update(
+                    attempts=F("attempts") + 1,
+                    next_attempt_at=timezone.now() + self.get_backoff(email),
+                    last_error=str(error),
+                )
+                failed += 1
+        if sent_pks:
+            OutgoingEmail.objects.filter(pk__in=sent_pks).update(
+                sent_at=timezone.now(), attempts=F("attempts") + 1
+            )
+        return len(sent_pks), failed
+
+    def get_backoff(self, email):
+        delay = timedelta(
+            seconds=self.options["backoff"] * 2 ** email.attempts
+        )
+        return min(delay, MAX_BACKOFF)
@@ -1,7 +1,9 @@
+from django.conf import settings
 from django.contrib.auth.base_user import BaseUserManager
 from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils import timezone
 
 
 class Role(models.TextChoices):
@@ -87,6 +89,11 @@ class User(AbstractUser):
 
     class Meta:
         ordering = ["-date_joined"]
+        indexes = (
+            models.Index(
+                fields=("date_joined", "id"), name="user_date_joined_id_idx"
+            ),
+        )
 
     def __str__(self):
         return self.username
@@ -98,3 +105,63 @@ class User(AbstractUser):
     @property
     def is_moderator(self):
         return self.role == Role.MODERATOR
+
+    def send_confirmation_code(self):
+        return OutgoingEmail.objects.enqueue(
+            subject="confirmation_code",
+            body=f"Ваш код - {self.confirmation_code}",
+            recipient=self.email,
+        )
+
+
+class OutgoingEmailQuerySet(models.QuerySet):
+    def enqueue(self, subject, body, recipient, from_email=None):
+        return self.create(
+            subject=subject,
+            body=body,
+            recipient=recipient,
+            from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        )
+
+    def due(self, max_attempts):
+        return self.filter(
+            sent_at__isnull=True,
+            next_attempt_at__lte=timezone.now(),
+            attempts__lt=max_attempts,
+        )
+
+
+class OutgoingEmail(models.Model):
+    subject = models.CharField(max_length=256, verbose_name="Тема")
+    body = models.TextField(verbose_name="Текст письма")
+    from_email = models.CharField(max_length=254, verbose_name="Отправитель")
+    recipient = models.EmailField(max_length=254, verbose_name="Получатель")
+    created_at = models.DateTimeField(
+        auto_now_add=True, verbose_name="Дата создания"
+    )
+    next_attempt_at = models.DateTimeField(
+        default=timezone.now, verbose_name="Следующая попытка"
+    )
+    attempts = models.PositiveIntegerField(
+        default=0, verbose_name="Количество попыток"
+    )
+    last_error = models.TextField(blank=True, verbose_name="Последняя ошибка")
+    sent_at = models.DateTimeField(
+        null=True, blank=True, verbose_name="Дата отправки"
+    )
+
+    objects = OutgoingEmailQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = "Исходящее письмо"
+        verbose_name_plural = "Исходящие письма"
+        ordering = ("next_attempt_at",)
+        indexes = (
+            models.Index(
+                fields=("sent_at", "next_attempt_at"),
+                name="outgoing_email_due_idx",
+            ),
+        )
+
+    def __str__(self):
+        return f"{self.recipient}: {self.subject}"
@@ -0,0 +1,10 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    from django.core.cache import cache
+
+    cache.clear()
+    yield
+    cache.clear()
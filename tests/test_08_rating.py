@@ -0,0 +1,146 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_reviews, create_single_review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08Rating:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def get_rating(self, client, title_id):
+        response = client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        )
+        assert response.status_code == HTTPStatus.OK
+        return response.json()['rating']
+
+    def test_01_rating_follows_review_changes(self, client, admin_client,
+                                              admin, user, user_client):
+        reviews, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        title_id = titles[0]['id']
+        assert self.get_rating(client, title_id) == 5
+
+        response = user_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[1]['id']
+            ),
+            data={'score': 9}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert self.get_rating(client, title_id) == 7, (
+            'Проверьте, что рейтинг произведения пересчитывается после '
+            'изменения оценки в отзыве.'
+        )
+
+        for review in reviews:
+            admin_client.delete(
+                self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                    title_id=title_id, review_id=review['id']
+                )
+            )
+        assert self.get_rating(client, title_id) is None, (
+            'Проверьте, что после удаления всех отзывов рейтинг '
+            'произведения становится `None`.'
+        )
+
+    def test_02_rebuild_ratings(self, client, admin_client, admin):
+        from reviews.models import Title
+
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        create_single_review(admin_client, titles[1]['id'], 'text', 2)
+        Title.objects.update(rating_sum=0, rating_count=0, rating=None)
+
+        call_command('rebuild_ratings')
+        assert self.get_rating(client, titles[0]['id']) == 5
+        assert self.get_rating(client, titles[1]['id']) == 2
+
+    def test_03_order_and_filter_by_rating(self, client, admin_client,
+                                           admin):
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        create_single_review(admin_client, titles[1]['id'], 'text', 8)
+
+        response = client.get('/api/v1/titles/?ordering=-rating')
+        results = response.json()['results']
+        assert [title['id'] for title in results] == [
+            titles[1]['id'], titles[0]['id']
+        ]
+        response = client.get('/api/v1/titles/?min_rating=6')
+        results = response.json()['results']
+        assert [title['id'] for title in results] == [titles[1]['id']]
+
+    def test_04_rating_follows_changes_outside_the_api(
+            self, client, admin_client, admin, user, user_client):
+        from reviews.models import Review
+
+        reviews, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        title_id = titles[0]['id']
+        review = Review.objects.get(pk=reviews[1]['id'])
+        review.score = 9
+        review.save()
+        assert self.get_rating(client, title_id) == 7, (
+            'Проверьте, что рейтинг пересчитывается при сохранении отзыва '
+            'вне API.'
+        )
+
+        user.delete()
+        assert self.get_rating(client, title_id) == 5, (
+            'Проверьте, что рейтинг пересчитывается, когда отзывы удаляются '
+            'каскадно вместе с автором.'
+        )
+        Review.objects.all().delete()
+        assert self.get_rating(client, title_id) is None, (
+            'Проверьте, что рейтинг пересчитывается при удалении отзывов '
+            'через `QuerySet.delete()`.'
+        )
+
+    def test_05_cascade_delete_updates_each_title_once(
+            self, client, admin_client, admin, user, user_client):
+        from django.db import connection, transaction
+        from django.test.utils import CaptureQueriesContext
+
+        from reviews.models import Review, Title
+
+        _, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        create_single_review(user_client, titles[1]['id'], 'text', 9)
+
+        def title_updates(context):
+            return [
+                query['sql'] for query in context.captured_queries
+                if query['sql'].startswith('UPDATE "reviews_title"')
+            ]
+
+        with CaptureQueriesContext(connection) as context:
+            Title.objects.get(pk=titles[0]['id']).delete()
+        assert title_updates(context) == [], (
+            'Проверьте, что при удалении произведения рейтинг не '
+            'пересчитывается для каждого удаляемого отзыва.'
+        )
+
+        create_single_review(admin_client, titles[1]['id'], 'text', 3)
+        with CaptureQueriesContext(connection) as context:
+            user.delete()
+        assert len(title_updates(context)) == 1
+        assert self.get_rating(client, titles[1]['id']) == 3
+
+        with transaction.atomic():
+            with pytest.raises(RuntimeError):
+                with transaction.atomic():
+                    Review.objects.all().delete()
+                    raise RuntimeError
+        assert self.get_rating(client, titles[1]['id']) == 3, (
+            'Проверьте, что откат точки сохранения отменяет и пересчёт '
+            'рейтинга.'
+        )
@@ -0,0 +1,167 @@
+import pytest
+from rest_framework.pagination import PageNumberPagination
+
+
+@pytest.fixture
+def catalog(db):
+    from reviews.models import Category, Genre, GenreTitle, Title
+
+    Category.objects.bulk_create(
+        Category(name=f'Категория {idx}', slug=f'category-{idx}')
+        for idx in range(5)
+    )
+    Genre.objects.bulk_create(
+        Genre(name=f'Жанр {idx}', slug=f'genre-{idx}') for idx in range(5)
+    )
+    categories = list(Category.objects.all())
+    genres = list(Genre.objects.all())
+    Title.objects.bulk_create(
+        Title(
+            name=f'Произведение {idx:04}',
+            year=2000,
+            category=categories[idx % len(categories)],
+        )
+        for idx in range(1000)
+    )
+    GenreTitle.objects.bulk_create(
+        GenreTitle(title=title, genre=genres[(title.pk + shift) % 5])
+        for title in Title.objects.all()
+        for shift in range(2)
+    )
+
+
+@pytest.mark.django_db
+class Test09QueryCount:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    @pytest.mark.parametrize('page_size', (10, 100, 1000))
+    def test_01_titles_list_queries(self, client, catalog, monkeypatch,
+                                    django_assert_num_queries, page_size):
+        monkeypatch.setattr(PageNumberPagination, 'page_size', page_size)
+        # Валидаторы условного GET, COUNT, страница произведений
+        # с категориями, жанры страницы.
+        with django_assert_num_queries(4):
+            response = client.get(self.TITLES_URL)
+        results = response.json()['results']
+        assert len(results) == page_size
+        assert all(len(title['genre']) == 2 for title in results), (
+            f'Проверьте, что `{self.TITLES_URL}` возвращает жанры '
+            'произведений.'
+        )
+        assert all(title['category'] for title in results)
+
+    def test_02_token_user_is_cached(self, user_client, user, admin_client,
+                                     django_assert_num_queries):
+        from core.user_cache import user_cache
+
+        user_cache.clear()
+        # Пользователь и COUNT категорий, затем ответ целиком из кэша.
+        with django_assert_num_queries(2):
+            user_client.get('/api/v1/categories/')
+        with django_assert_num_queries(0):
+            response = user_client.get('/api/v1/categories/')
+        assert response.status_code == 200, (
+            'Проверьте, что пользователь с токеном, взятый из кэша, '
+            'проходит аутентификацию.'
+        )
+
+        response = user_client.post(
+            '/api/v1/categories/', data={'name': 'Фильм', 'slug': 'films'}
+        )
+        assert response.status_code == 403
+        admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'role': 'admin'}
+        )
+        response = user_client.post(
+            '/api/v1/categories/', data={'name': 'Фильм', 'slug': 'films'}
+        )
+        assert response.status_code == 201, (
+            'Проверьте, что после смены роли пользователя через '
+            '`/api/v1/users/{username}/` кэш пользователя сбрасывается.'
+        )
+
+    @pytest.mark.parametrize('page_size', (10, 50))
+    def test_03_reviews_and_comments_queries(self, client, monkeypatch,
+                                             django_assert_num_queries,
+                                             page_size):
+        from reviews.models import Comment, Review, Title
+        from users.models import User
+
+        monkeypatch.setattr(PageNumberPagination, 'page_size', page_size)
+        title = Title.objects.create(name='Произведение', year=2000)
+        User.objects.bulk_create(
+            User(username=f'author{idx}', email=f'author{idx}@yamdb.fake')
+            for idx in range(page_size)
+        )
+        authors = list(User.objects.all())
+        Review.objects.bulk_create(
+            Review(title=title, author=author, text='text', score=5)
+            for author in authors
+        )
+        review = Review.objects.first()
+        Comment.objects.bulk_create(
+            Comment(review=review, author=author, text='text')
+            for author in authors
+        )
+
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        # Произведение, валидаторы условного GET, COUNT и страница отзывов
+        # вместе с авторами.
+        with django_assert_num_queries(4):
+            response = client.get(url)
+        usernames = {review['author'] for review in response.json()['results']}
+        assert usernames == {author.username for author in authors}
+
+        url = f'{url}{review.id}/comments/'
+        with django_assert_num_queries(4):
+            response = client.get(url)
+        assert len(response.json()['results']) == page_size, (
+            f'Проверьте, что `{url}` возвращает комментарии с авторами за '
+            'постоянное число запросов.'
+        )
+
+    def test_04_review_create_queries(self, user_client):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        from reviews.models import Title
+
+        def statements(context):
+            # Без SAVEPOINT/RELEASE, которые добавляет транзакция теста.
+            return [
+                query['sql'].split()[0]
+                for query in context.captured_queries
+                if 'SAVEPOINT' not in query['sql']
+            ]
+
+        title = Title.objects.create(name='Произведение', year=2000)
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        data = {'text': 'Отзыв', 'score': 7}
+        # Пользователь из токена, чтобы дальше он брался из кэша.
+        user_client.get('/api/v1/categories/')
+
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.post(url, data=data)
+        assert response.status_code == 201
+        assert statements(context) == [
+            'SELECT', 'INSERT', 'UPDATE', 'UPDATE'
+        ], (
+            'Проверьте, что создание отзыва выполняет один SELECT '
+            'произведения, INSERT отзыва и UPDATE рейтинга и лидербордов.'
+        )
+
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.post(url, data=data)
+        assert response.status_code == 400, (
+            'Проверьте, что повторный отзыв на то же произведение '
+            'отклоняется ограничением уникальности со статусом 400.'
+        )
+        assert statements(context) == ['SELECT', 'INSERT']
+        assert response.json() == {
+            'non_field_errors': [
+                'You cannot leave a second review for this title.'
+            ]
+        }
+        title.refresh_from_db()
+        assert (title.rating_count, title.rating) == (1, 7)
@@ -0,0 +1,68 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10Pagination:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def create_many_titles(self, admin_client, count):
+        from reviews.models import Title
+
+        create_titles(admin_client)
+        Title.objects.bulk_create(
+            Title(name='Одинаковое название', year=2000)
+            for _ in range(count)
+        )
+        return list(Title.objects.order_by('name', 'id').values_list(
+            'id', flat=True
+        ))
+
+    def test_01_page_size(self, client, admin_client):
+        self.create_many_titles(admin_client, 150)
+        response = client.get(f'{self.TITLES_URL}?page_size=5')
+        assert len(response.json()['results']) == 5, (
+            'Проверьте, что параметр `page_size` задаёт размер страницы.'
+        )
+        response = client.get(f'{self.TITLES_URL}?page_size=1000')
+        assert len(response.json()['results']) == 100, (
+            'Проверьте, что размер страницы ограничен сверху.'
+        )
+
+    def test_02_cursor_walks_all_titles(self, client, admin_client):
+        expected_ids = self.create_many_titles(admin_client, 25)
+        url = f'{self.TITLES_URL}?cursor=&page_size=7'
+        ids = []
+        while url:
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            data = response.json()
+            assert 'count' not in data
+            ids.extend(title['id'] for title in data['results'])
+            url = data['next']
+        assert ids == expected_ids, (
+            'Проверьте, что курсорная пагинация возвращает все '
+            'произведения по одному разу в порядке `name`, `id`.'
+        )
+
+    def test_03_page_number_still_works(self, client, admin_client):
+        expected_ids = self.create_many_titles(admin_client, 25)
+        response = client.get(f'{self.TITLES_URL}?page=2')
+        data = response.json()
+        assert data['count'] == len(expected_ids)
+        assert [title['id'] for title in data['results']] == (
+            expected_ids[10:20]
+        )
+
+    def test_04_cursor_rejects_ordering(self, client, admin_client):
+        self.create_many_titles(admin_client, 5)
+        response = client.get(f'{self.TITLES_URL}?cursor=&ordering=-year')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что курсорная пагинация не игнорирует параметр '
+            '`ordering` молча, а возвращает ответ со статусом 400.'
+        )
+        assert 'ordering' in response.json()
@@ -0,0 +1,96 @@
+from smtplib import SMTPException
+from unittest import mock
+
+import pytest
+from django.core import mail
+from django.core.management import call_command
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11Outbox:
+    URL_SIGNUP = '/api/v1/auth/signup/'
+    BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+
+    def signup(self, client, username='valid_username'):
+        from users.models import OutgoingEmail
+
+        email = f'{username}@yamdb.fake'
+        client.post(
+            self.URL_SIGNUP, data={'email': email, 'username': username}
+        )
+        return OutgoingEmail.objects.get(recipient=email)
+
+    def test_01_outbox_is_drained_in_batches(self, client):
+        email = self.signup(client)
+        assert email.sent_at is None
+
+        call_command('send_emails', batch_size=1, connections=2)
+        email.refresh_from_db()
+        assert email.sent_at is not None, (
+            'Проверьте, что команда `send_emails` отправляет письма из '
+            'очереди и отмечает их отправленными.'
+        )
+        assert len(mail.outbox) == 1
+        call_command('send_emails')
+        assert len(mail.outbox) == 1, (
+            'Проверьте, что отправленные письма не отправляются повторно.'
+        )
+
+    def test_02_failed_email_is_retried_later(self, client):
+        email = self.signup(client)
+        with mock.patch(
+            f'{self.BACKEND}.send_messages',
+            side_effect=SMTPException('SMTP недоступен')
+        ):
+            call_command('send_emails')
+        email.refresh_from_db()
+        assert email.sent_at is None
+        assert email.attempts == 1
+        assert 'SMTP недоступен' in email.last_error
+        assert email.next_attempt_at > email.created_at, (
+            'Проверьте, что повторная отправка письма откладывается.'
+        )
+        assert len(mail.outbox) == 0
+
+    def test_03_unavailable_server_fails_the_batch(self, client):
+        email = self.signup(client)
+        with mock.patch(
+            f'{self.BACKEND}.open',
+            side_effect=ConnectionRefusedError('SMTP недоступен')
+        ):
+            call_command('send_emails')
+        email.refresh_from_db()
+        assert email.sent_at is None
+        assert email.attempts == 1, (
+            'Проверьте, что письмо, которое не удалось отправить из-за '
+            'недоступного SMTP-сервера, отложено для повторной отправки.'
+        )
+        assert 'SMTP недоступен' in email.last_error
+
+    def test_04_failures_are_recorded_per_email(self, client):
+        first = self.signup(client, 'first_user')
+        second = self.signup(client, 'second_user')
+        send_messages = mail.get_connection().send_messages.__func__
+
+        def fail_first(backend, messages):
+            if messages[0].to == [first.recipient]:
+                raise SMTPException('Адрес отклонён')
+            return send_messages(backend, messages)
+
+        with mock.patch(f'{self.BACKEND}.send_messages', fail_first):
+            call_command('send_emails')
+        first.refresh_from_db()
+        second.refresh_from_db()
+        assert first.sent_at is None and first.attempts == 1
+        assert second.sent_at is not None, (
+            'Проверьте, что ошибка отправки одного письма не помечает '
+            'неотправленными остальные письма пачки.'
+        )
+        assert [message.to for message in mail.outbox] == [
+            [second.recipient]
+        ]
+        call_command('send_emails')
+        assert len(mail.outbox) == 1, (
+            'Проверьте, что отправленные письма пачки не отправляются '
+            'повторно.'
+        )
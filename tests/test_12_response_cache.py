@@ -0,0 +1,84 @@
+import pytest
+
+from tests.utils import create_categories, create_reviews
+
+
+@pytest.fixture(params=('locmem', 'filebased'))
+def cache_backend(request, settings, tmp_path):
+    backends = {
+        'locmem': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        },
+        'filebased': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': str(tmp_path),
+        },
+    }
+    settings.CACHES = {'default': backends[request.param]}
+    return request.param
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12ResponseCache:
+    CATEGORIES_URL = '/api/v1/categories/'
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    def test_01_catalog_is_cached_and_invalidated(self, client, admin_client,
+                                                  cache_backend):
+        from api.cache import response_cache
+
+        stats = response_cache.stats()
+        create_categories(admin_client)
+        response = client.get(self.CATEGORIES_URL)
+        assert response['X-Cache'] == 'MISS'
+        response = client.get(self.CATEGORIES_URL)
+        assert response['X-Cache'] == 'HIT', (
+            f'Проверьте, что повторный GET-запрос к `{self.CATEGORIES_URL}` '
+            'обслуживается из кэша.'
+        )
+        assert response.json()['count'] == 2
+        assert response_cache.stats()['hits'] == stats['hits'] + 1
+        assert response_cache.stats()['misses'] == stats['misses'] + 1
+
+        admin_client.post(
+            self.CATEGORIES_URL, data={'name': 'Музыка', 'slug': 'music'}
+        )
+        response = client.get(self.CATEGORIES_URL)
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['count'] == 3, (
+            'Проверьте, что после создания категории кэш списка категорий '
+            'сбрасывается.'
+        )
+
+    def test_02_title_cache_follows_reviews(self, client, admin_client,
+                                            admin, user, user_client):
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+        url = self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        assert client.get(url).json()['rating'] == 5
+        assert client.get(url)['X-Cache'] == 'HIT'
+
+        user_client.post(f'{url}reviews/', data={'text': 'text', 'score': 9})
+        response = client.get(url)
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['rating'] == 7, (
+            'Проверьте, что новый отзыв сбрасывает кэш произведения.'
+        )
+
+    def test_03_cascade_invalidates_once(self, admin_client, admin, user,
+                                         user_client, monkeypatch):
+        from api.cache import response_cache
+        from reviews.models import Title
+
+        _, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        calls = []
+        monkeypatch.setattr(
+            response_cache, 'invalidate',
+            lambda *namespaces: calls.append(set(namespaces))
+        )
+        Title.objects.get(pk=titles[0]['id']).delete()
+        assert calls == [{'titles'}], (
+            'Проверьте, что каскадное удаление сбрасывает кэш одной записью '
+            'после коммита, а не по записи на каждую удалённую строку.'
+        )
@@ -0,0 +1,84 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13ConditionalGet:
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def test_01_reviews_not_modified(self, client, admin_client, admin,
+                                     django_assert_num_queries):
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        response = client.get(url)
+        etag = response['ETag']
+        assert etag, (
+            f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+            'заголовок `ETag`.'
+        )
+        assert not response.has_header('Last-Modified'), (
+            'Проверьте, что `Last-Modified` не отправляется: он округляется '
+            'до секунд и пропускает изменения внутри одной секунды.'
+        )
+
+        # Произведение и валидаторы, без выборки и сериализации отзывов.
+        with django_assert_num_queries(2):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{url}` с актуальным '
+            '`If-None-Match` возвращает ответ со статусом 304.'
+        )
+
+        admin_client.patch(
+            f'{url}{reviews[0]["id"]}/', data={'text': 'новый текст'}
+        )
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после изменения отзыва `ETag` списка отзывов '
+            'меняется.'
+        )
+        assert response['ETag'] != etag
+
+    def test_02_title_detail_not_modified(self, client, admin_client,
+                                          admin, django_assert_num_queries):
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        # Произведение и его жанры, произведение выбирается один раз.
+        with django_assert_num_queries(2):
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        with django_assert_num_queries(0):
+            response = client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что `ETag` детальной страницы произведения берётся '
+            'из кеша ответов.'
+        )
+
+    def test_03_cached_title_list_needs_no_queries(
+            self, client, admin_client, admin, django_assert_num_queries):
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        url = '/api/v1/titles/'
+        etag = client.get(url)['ETag']
+        with django_assert_num_queries(0):
+            response = client.get(url)
+        assert response['X-Cache'] == 'HIT'
+        assert response['ETag'] == etag, (
+            'Проверьте, что `ETag` списка произведений хранится в кеше '
+            'вместе с ответом, без запроса к базе данных.'
+        )
+        with django_assert_num_queries(0):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+        admin_client.patch(
+            f'{url}{titles[0]["id"]}/', data={'name': 'Новое название'}
+        )
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK
+        assert response['ETag'] != etag, (
+            'Проверьте, что после изменения произведения `ETag` списка '
+            'меняется.'
+        )
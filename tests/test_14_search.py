@@ -0,0 +1,60 @@
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_reviews, create_single_review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14Search:
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def test_01_title_search(self, client, admin_client, admin):
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        admin_client.patch(
+            f'{self.TITLES_URL}{titles[1]["id"]}/',
+            data={'description': 'Терминатор тут только в описании'}
+        )
+
+        response = client.get(f'{self.TITLES_URL}?search=терминат')
+        results = response.json()['results']
+        assert [title['id'] for title in results] == [
+            titles[0]['id'], titles[1]['id']
+        ], (
+            'Проверьте, что `?search=` находит произведения по названию и '
+            'описанию и ставит совпадения в названии выше.'
+        )
+        assert '<b>' in results[0]['snippet']
+
+        admin_client.patch(
+            f'{self.TITLES_URL}{titles[1]["id"]}/',
+            data={'description': '<img src=x onerror=alert(1)> терминатор'}
+        )
+        response = client.get(f'{self.TITLES_URL}?search=терминат')
+        snippet = response.json()['results'][1]['snippet']
+        assert '<img' not in snippet and '&lt;img' in snippet, (
+            'Проверьте, что текст фрагмента экранируется перед добавлением '
+            'тегов `<b>`.'
+        )
+        assert '<b>терминатор</b>' in snippet
+
+        response = client.get(f'{self.TITLES_URL}?search=")(*')
+        assert response.json()['results'] == []
+        assert 'snippet' not in client.get(self.TITLES_URL).json()[
+            'results'
+        ][0]
+
+    def test_02_review_search_and_rebuild(self, client, admin_client, admin,
+                                          user_client):
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        create_single_review(
+            user_client, titles[0]['id'], 'Великолепные спецэффекты', 9
+        )
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+
+        call_command('rebuild_search_index')
+        response = client.get(f'{url}?search=спецэффект')
+        results = response.json()['results']
+        assert [review['score'] for review in results] == [9], (
+            f'Проверьте, что `?search=` на `{url}` ищет по тексту отзывов.'
+        )
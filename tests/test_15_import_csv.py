@@ -0,0 +1,71 @@
+import json
+
+import pytest
+from django.core.management import call_command
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15ImportCsv:
+
+    def test_01_import_bundled_csv(self, client, tmp_path):
+        from reviews.models import Comment, GenreTitle, Review, Title
+
+        checkpoint = tmp_path / 'checkpoint.json'
+        call_command(
+            'import_csv', batch_size=10, checkpoint=str(checkpoint)
+        )
+        assert Title.objects.count() == 32
+        assert GenreTitle.objects.count() == 42
+        assert Review.objects.count() == 72
+        assert Comment.objects.count() == 3
+        assert json.loads(checkpoint.read_text())['review.csv'] == 72
+
+        response = client.get('/api/v1/titles/1/')
+        assert response.json()['rating'] == 10, (
+            'Проверьте, что после импорта пересчитываются рейтинги '
+            'произведений.'
+        )
+        review = Review.objects.get(pk=1)
+        assert review.pub_date.year == 2019, (
+            'Проверьте, что при импорте сохраняется `pub_date` из CSV.'
+        )
+
+        call_command('import_csv', batch_size=10, reset=True)
+        assert Review.objects.count() == 72, (
+            'Проверьте, что повторный импорт не создаёт дубликатов.'
+        )
+
+    def test_02_conflicting_rows_are_not_referenced(self, tmp_path):
+        from reviews.models import Review
+        from users.models import User
+
+        files = {
+            'users.csv': (
+                'id,username,email,role,bio,first_name,last_name\n'
+                '1,reviewer,reviewer@yamdb.fake,user,,,\n'
+                '2,reviewer,other@yamdb.fake,user,,,\n'
+            ),
+            'category.csv': 'id,name,slug\n1,Фильм,movie\n',
+            'genre.csv': 'id,name,slug\n1,Драма,drama\n',
+            'titles.csv': 'id,name,year,category\n1,Фильм,1994,1\n',
+            'genre_title.csv': 'id,title_id,genre_id\n1,1,1\n',
+            'review.csv': (
+                'id,title_id,text,author,score,pub_date\n'
+                '1,1,Текст,1,10,2019-01-01T00:00:00Z\n'
+                '2,1,Текст,2,1,2019-01-01T00:00:00Z\n'
+            ),
+            'comments.csv': 'id,review_id,text,author,pub_date\n',
+        }
+        for name, content in files.items():
+            (tmp_path / name).write_text(content, encoding='utf-8')
+
+        call_command('import_csv', path=str(tmp_path))
+        assert list(User.objects.values_list('pk', flat=True)) == [1]
+        assert len(User.objects.get(pk=1).confirmation_code) == 12, (
+            'Проверьте, что импортированным пользователям генерируется '
+            '`confirmation_code`.'
+        )
+        assert list(Review.objects.values_list('pk', flat=True)) == [1], (
+            'Проверьте, что строки, ссылающиеся на пропущенные из-за '
+            'конфликта записи, не импортируются.'
+        )
@@ -0,0 +1,51 @@
+import json
+
+import pytest
+from django.core.management import call_command
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16Benchmark:
+
+    def test_01_generate_dataset_and_benchmark(self, tmp_path):
+        from reviews.models import GenreTitle, Review, Title
+        from users.models import Role, User
+
+        call_command(
+            'generate_dataset', titles=50, users=30, reviews_per_title=5,
+            comments_per_review=1, seed=1
+        )
+        assert Title.objects.count() == 50
+        assert GenreTitle.objects.count() >= 50
+        counts = sorted(
+            Title.objects.values_list('rating_count', flat=True),
+            reverse=True
+        )
+        assert counts[0] > 5 > counts[-1], (
+            'Проверьте, что количество отзывов распределено неравномерно.'
+        )
+        assert sum(counts) == Review.objects.count()
+        assert not User.objects.filter(role=Role.ADMIN).exists(), (
+            'Проверьте, что `generate_dataset` не создаёт администраторов.'
+        )
+        codes = User.objects.values_list('confirmation_code', flat=True)
+        assert len(set(codes)) == 30 and all(codes), (
+            'Проверьте, что сгенерированные пользователи получают '
+            'случайные коды подтверждения.'
+        )
+
+        output = tmp_path / 'result.json'
+        call_command(
+            'benchmark', requests=5, warmup=1, output=str(output),
+            scenarios=[
+                'title-list', 'title-facets', 'review-list', 'auth-token'
+            ]
+        )
+        result = json.loads(output.read_text())
+        assert set(result['scenarios']) == {
+            'title-list', 'title-facets', 'review-list', 'auth-token'
+        }
+        for scenario in result['scenarios'].values():
+            assert scenario['status_codes'] == {'200': 5}
+            assert scenario['p50_ms'] <= scenario['p99_ms']
+            assert 'queries_per_request' in scenario
@@ -0,0 +1,33 @@
+import json
+import logging
+
+import pytest
+from django.test import Client
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17ServerTiming:
+    CATEGORIES_URL = '/api/v1/categories/'
+
+    def test_01_server_timing_header(self, client):
+        response = client.get(self.CATEGORIES_URL)
+        header = response['Server-Timing']
+        assert header.startswith('db;desc="1 queries";dur='), (
+            'Проверьте, что заголовок `Server-Timing` содержит количество '
+            'SQL-запросов и время работы с базой данных.'
+        )
+        assert 'total;dur=' in header
+
+    def test_02_sampling_and_log(self, settings, caplog):
+        settings.QUERY_TIMING_SAMPLE_RATE = 0
+        response = Client().get(self.CATEGORIES_URL)
+        assert 'Server-Timing' not in response
+
+        settings.QUERY_TIMING_SAMPLE_RATE = 1
+        settings.QUERY_TIMING_LOG = True
+        with caplog.at_level(logging.INFO, logger='core.middleware'):
+            Client().get(f'{self.CATEGORIES_URL}?page=1')
+        record = json.loads(caplog.records[-1].getMessage())
+        assert record['path'] == self.CATEGORIES_URL
+        assert record['queries'] == 1
+        assert 'reviews_category' in record['slowest_sql']
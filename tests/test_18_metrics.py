@@ -0,0 +1,61 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from tests.conftest import MANAGE_PATH
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18Metrics:
+    METRICS_URL = '/metrics'
+
+    def test_01_metrics_by_route(self, client):
+        client.get('/api/v1/categories/')
+        client.get('/api/v1/categories/')
+        response = client.get(self.METRICS_URL)
+        assert response.status_code == 200
+        assert response['Content-Type'].startswith('text/plain')
+        body = response.content.decode()
+        for line in (
+            'yamdb_http_requests_total{method="GET",'
+            'route="category-list",status="200"}',
+            'yamdb_http_request_duration_seconds_bucket{le="0.005",'
+            'method="GET",route="category-list"}',
+            'yamdb_http_requests_in_progress{method="GET",route="metrics"} '
+            '1.0',
+            'yamdb_db_queries_total{route="category-list"}',
+            'yamdb_response_cache_requests_total{namespace="categories",'
+            'result="hit"}',
+        ):
+            assert line in body, (
+                f'Проверьте, что `{self.METRICS_URL}` отдаёт метрику '
+                f'`{line}`.'
+            )
+
+    def test_02_metrics_are_shared_between_processes(self, tmp_path):
+        env = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=str(tmp_path))
+        increment = (
+            'from core.metrics import REQUESTS; '
+            'REQUESTS.labels("title-list", "GET", 200).inc()'
+        )
+        for _ in range(2):
+            subprocess.run(
+                [sys.executable, '-c', increment],
+                cwd=MANAGE_PATH, env=env, check=True
+            )
+        output = subprocess.run(
+            [
+                sys.executable, '-c',
+                'from prometheus_client import generate_latest; '
+                'from core.metrics import get_registry; '
+                'print(generate_latest(get_registry()).decode())'
+            ],
+            cwd=MANAGE_PATH, env=env, check=True, capture_output=True,
+            text=True
+        ).stdout
+        assert (
+            'yamdb_http_requests_total{method="GET",route="title-list",'
+            'status="200"} 2.0'
+        ) in output
@@ -0,0 +1,157 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.fixture
+def leaderboard_settings(settings):
+    settings.LEADERBOARD_MIN_REVIEWS = 2
+    settings.LEADERBOARD_PRIOR_MEAN = 5
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19Leaderboard:
+
+    TOP_URL = '/api/v1/titles/top/'
+    MOST_REVIEWED_URL = '/api/v1/titles/most-reviewed/'
+
+    def get_board(self, client, url, **params):
+        response = client.get(url, params)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` возвращает ответ со '
+            'статусом 200.'
+        )
+        return [
+            (entry['title']['name'], entry['score'], entry['reviews'])
+            for entry in response.json()
+        ]
+
+    def test_01_top_follows_reviews(self, client, admin_client, user_client,
+                                    leaderboard_settings):
+        titles, _, _ = create_titles(admin_client)
+        terminator, die_hard = titles
+        create_single_review(admin_client, terminator['id'], 'Отзыв', 10)
+        create_single_review(user_client, terminator['id'], 'Отзыв', 8)
+        create_single_review(admin_client, die_hard['id'], 'Отзыв', 9)
+
+        assert self.get_board(client, self.TOP_URL) == [
+            ('Терминатор', 7, 2)
+        ], (
+            'Проверьте, что `/api/v1/titles/top/` ранжирует произведения по '
+            'байесовскому рейтингу и пропускает произведения с числом '
+            'отзывов меньше LEADERBOARD_MIN_REVIEWS.'
+        )
+        assert self.get_board(client, self.MOST_REVIEWED_URL) == [
+            ('Терминатор', 7, 2), ('Крепкий орешек', None, 1)
+        ]
+
+        create_single_review(user_client, die_hard['id'], 'Отзыв', 10)
+        assert self.get_board(client, self.TOP_URL) == [
+            ('Крепкий орешек', 7.25, 2), ('Терминатор', 7, 2)
+        ], (
+            'Проверьте, что лидерборд обновляется после нового отзыва.'
+        )
+        assert self.get_board(client, self.TOP_URL, limit=1) == [
+            ('Крепкий орешек', 7.25, 2)
+        ]
+        assert self.get_board(
+            client, self.TOP_URL, category='films'
+        ) == [('Терминатор', 7, 2)]
+        assert self.get_board(
+            client, self.TOP_URL, genre='drama'
+        ) == [('Крепкий орешек', 7.25, 2)]
+        assert self.get_board(
+            client, self.TOP_URL, category='films', genre='comedy'
+        ) == [('Терминатор', 7, 2)]
+        assert self.get_board(
+            client, self.TOP_URL, category='books', genre='horror'
+        ) == []
+
+        response = client.get(self.TOP_URL, {'limit': 'много'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_02_top_follows_catalog_changes(self, client, admin_client,
+                                            user_client,
+                                            leaderboard_settings):
+        titles, _, _ = create_titles(admin_client)
+        terminator = titles[0]
+        create_single_review(admin_client, terminator['id'], 'Отзыв', 10)
+        create_single_review(user_client, terminator['id'], 'Отзыв', 8)
+
+        response = admin_client.patch(
+            f'/api/v1/titles/{terminator["id"]}/',
+            data={'genre': ['drama'], 'category': 'books'},
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert self.get_board(client, self.TOP_URL, genre='horror') == []
+        assert self.get_board(
+            client, self.TOP_URL, category='books', genre='drama'
+        ) == [('Терминатор', 7, 2)], (
+            'Проверьте, что лидерборды жанров и категорий обновляются при '
+            'изменении произведения.'
+        )
+
+        response = user_client.get(
+            f'/api/v1/titles/{terminator["id"]}/reviews/'
+        )
+        review_id = next(
+            review['id'] for review in response.json()['results']
+            if review['author'] == 'TestUser'
+        )
+        user_client.delete(
+            f'/api/v1/titles/{terminator["id"]}/reviews/{review_id}/'
+        )
+        assert self.get_board(client, self.TOP_URL) == []
+        assert self.get_board(client, self.MOST_REVIEWED_URL) == [
+            ('Терминатор', None, 1)
+        ]
+
+        admin_client.delete('/api/v1/categories/books/')
+        assert self.get_board(
+            client, self.MOST_REVIEWED_URL, category='books'
+        ) == []
+        assert self.get_board(
+            client, self.MOST_REVIEWED_URL, genre='drama'
+        ) == [('Терминатор', None, 1)]
+
+    def test_03_rebuild_and_query_count(self, client, admin,
+                                        leaderboard_settings,
+                                        django_assert_num_queries):
+        from reviews.models import (Category, Genre, GenreTitle,
+                                    LeaderboardEntry, Review, Title)
+
+        category = Category.objects.create(name='Фильм', slug='films')
+        genre = Genre.objects.create(name='Драма', slug='drama')
+        Title.objects.bulk_create(
+            Title(name=f'Произведение {idx:03}', year=2000, category=category)
+            for idx in range(60)
+        )
+        titles = list(Title.objects.all())
+        GenreTitle.objects.bulk_create(
+            GenreTitle(title=title, genre=genre) for title in titles
+        )
+        Review.objects.bulk_create(
+            Review(title=title, author=admin, text='Отзыв', score=score)
+            for title, score in zip(titles, range(1, 11))
+        )
+        LeaderboardEntry.objects.all().delete()
+
+        call_command('rebuild_ratings')
+        assert LeaderboardEntry.objects.count() == 60 * 4, (
+            'Проверьте, что `rebuild_ratings` пересоздаёт лидерборды: '
+            'общий, категории, жанра и категории с жанром.'
+        )
+        # Ни у одного произведения нет двух отзывов.
+        assert self.get_board(client, self.TOP_URL) == []
+
+        # Позиции вместе с произведениями и категориями, затем их жанры.
+        with django_assert_num_queries(2):
+            board = self.get_board(
+                client, self.MOST_REVIEWED_URL,
+                category='films', genre='drama', limit=50,
+            )
+        assert len(board) == 10
+        assert all(reviews == 1 for _, _, reviews in board)
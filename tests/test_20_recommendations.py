@@ -0,0 +1,98 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+SCORES = {
+    'Любимое': (9, 10, 8),
+    'Похожее': (9, 9, 10),
+    'Нелюбимое': (2, 1, 3),
+    'Среднее': (5, 7, 4),
+}
+
+
+@pytest.fixture
+def rated_catalog(db, user, django_user_model):
+    from reviews.models import Review, Title
+
+    Title.objects.bulk_create(
+        Title(name=name, year=2000) for name in SCORES
+    )
+    titles = {title.name: title for title in Title.objects.all()}
+    critics = [
+        django_user_model.objects.create_user(
+            username=f'critic{idx}', email=f'critic{idx}@yamdb.fake'
+        )
+        for idx in range(3)
+    ]
+    Review.objects.bulk_create(
+        Review(title=titles[name], author=critic, text='Отзыв', score=score)
+        for name, scores in SCORES.items()
+        for critic, score in zip(critics, scores)
+    )
+    Review.objects.bulk_create(
+        Review(title=titles[name], author=user, text='Отзыв', score=score)
+        for name, score in (('Любимое', 10), ('Нелюбимое', 2))
+    )
+    return titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20Recommendations:
+
+    def test_01_similar_titles(self, client, rated_catalog,
+                               django_assert_num_queries):
+        call_command('build_recommendations', shrinkage=0)
+        title = rated_catalog['Любимое']
+        url = f'/api/v1/titles/{title.id}/similar/'
+
+        # Произведение, соседи вместе с категориями и жанры соседей.
+        with django_assert_num_queries(3):
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        similar = [item['title']['name'] for item in response.json()]
+        assert similar[0] == 'Похожее', (
+            f'Проверьте, что `{url}` возвращает самые похожие по оценкам '
+            'произведения первыми.'
+        )
+        assert 'Нелюбимое' not in similar, (
+            'Проверьте, что произведения с отрицательным сходством не '
+            'попадают в похожие.'
+        )
+        scores = [item['score'] for item in response.json()]
+        assert scores == sorted(scores, reverse=True)
+        assert all(0 < score <= 1 for score in scores)
+
+        response = client.get(url, {'limit': 1})
+        assert len(response.json()) == 1
+        response = client.get('/api/v1/titles/0/similar/')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+        response = client.get('/api/v1/titles/abc/similar/')
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что запрос похожих произведений с нечисловым '
+            'идентификатором возвращает ответ со статусом 404.'
+        )
+
+    def test_02_user_recommendations(self, client, user_client,
+                                     rated_catalog):
+        url = '/api/v1/users/me/recommendations/'
+        assert client.get(url).status_code == HTTPStatus.UNAUTHORIZED
+        response = user_client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == [], (
+            'Проверьте, что без построенной модели рекомендации пусты.'
+        )
+
+        call_command('build_recommendations', shrinkage=0)
+        response = user_client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        recommended = [item['title']['name'] for item in response.json()]
+        assert recommended[0] == 'Похожее', (
+            f'Проверьте, что `{url}` рекомендует произведения, похожие на '
+            'высоко оценённые пользователем.'
+        )
+        assert not {'Любимое', 'Нелюбимое'} & set(recommended), (
+            'Проверьте, что в рекомендации не попадают произведения, на '
+            'которые пользователь уже оставил отзыв.'
+        )
+        assert response.json()[0]['score'] > 6
@@ -0,0 +1,76 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21Facets:
+
+    URL = '/api/v1/titles/'
+
+    def test_01_facet_counts(self, client, admin_client):
+        create_titles(admin_client)
+        admin_client.post(self.URL, data={
+            'name': 'Терминатор 2',
+            'year': 1991,
+            'genre': ['horror'],
+            'category': 'films',
+        })
+
+        response = client.get(self.URL, {'facets': 'genre,category,year'})
+        assert response.status_code == HTTPStatus.OK
+        facets = response.json()['facets']
+        assert facets == {
+            'genre': [
+                {'slug': 'horror', 'name': 'Ужасы', 'count': 2},
+                {'slug': 'comedy', 'name': 'Комедия', 'count': 1},
+                {'slug': 'drama', 'name': 'Драма', 'count': 1},
+            ],
+            'category': [
+                {'slug': 'films', 'name': 'Фильм', 'count': 2},
+                {'slug': 'books', 'name': 'Книги', 'count': 1},
+            ],
+            'year': [
+                {'year': 1984, 'count': 1},
+                {'year': 1988, 'count': 1},
+                {'year': 1991, 'count': 1},
+            ],
+        }, (
+            f'Проверьте, что `{self.URL}?facets=genre,category,year` '
+            'возвращает количество произведений по жанрам, категориям и годам.'
+        )
+        assert response.json()['count'] == 3
+        assert 'facets' not in client.get(self.URL).json()
+
+    def test_02_facets_follow_filters(self, client, admin_client,
+                                      django_assert_num_queries):
+        create_titles(admin_client)
+
+        response = client.get(
+            self.URL, {'facets': 'year,category', 'category': 'films'}
+        )
+        assert response.json()['facets'] == {
+            'year': [{'year': 1984, 'count': 1}],
+            'category': [{'slug': 'films', 'name': 'Фильм', 'count': 1}],
+        }, (
+            'Проверьте, что количество в фасетах учитывает фильтры запроса.'
+        )
+        response = client.get(
+            self.URL, {'facets': 'category', 'search': 'орешек'}
+        )
+        assert response.json()['facets'] == {
+            'category': [{'slug': 'books', 'name': 'Книги', 'count': 1}],
+        }
+
+        # Валидаторы условного GET, COUNT, страница, жанры и все фасеты
+        # одним запросом.
+        with django_assert_num_queries(5):
+            client.get(self.URL, {'facets': 'genre,category,year', 'page': 1})
+
+        response = client.get(self.URL, {'facets': 'genre,rating'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что неизвестный фасет возвращает ответ со статусом '
+            '400.'
+        )
@@ -0,0 +1,74 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22TitleFilter:
+
+    URL = '/api/v1/titles/'
+
+    def get_names(self, client, **params):
+        response = client.get(self.URL, params)
+        assert response.status_code == HTTPStatus.OK
+        return sorted(title['name'] for title in response.json()['results'])
+
+    def test_01_exact_and_multiple_slugs(self, client, admin_client):
+        create_titles(admin_client)
+        admin_client.post('/api/v1/genres/', data={
+            'name': 'Хоррор-комедия', 'slug': 'horror-comedy'
+        })
+        admin_client.post(self.URL, data={
+            'name': 'Зомбилэнд',
+            'year': 2009,
+            'genre': ['horror-comedy', 'comedy'],
+            'category': 'films',
+        })
+
+        assert self.get_names(client, genre='horror') == ['Терминатор'], (
+            'Проверьте, что фильтр `genre` сравнивает slug целиком.'
+        )
+        assert self.get_names(client, genre='drama,comedy') == [
+            'Зомбилэнд', 'Крепкий орешек', 'Терминатор'
+        ], (
+            'Проверьте, что `?genre=a,b` возвращает произведения хотя бы с '
+            'одним из жанров.'
+        )
+        assert self.get_names(client, genre__all='horror,comedy') == [
+            'Терминатор'
+        ], (
+            'Проверьте, что `?genre__all=a,b` возвращает произведения со '
+            'всеми перечисленными жанрами.'
+        )
+        assert self.get_names(client, genre__all='horror,unknown') == []
+        assert self.get_names(client, genre='unknown') == []
+        assert self.get_names(client, category='films') == [
+            'Зомбилэнд', 'Терминатор'
+        ]
+        assert self.get_names(client, category='films,books') == [
+            'Зомбилэнд', 'Крепкий орешек', 'Терминатор'
+        ]
+        assert self.get_names(client, category='film') == []
+
+        assert self.get_names(client, genre__icontains='horror') == [
+            'Зомбилэнд', 'Терминатор'
+        ], (
+            'Проверьте, что поиск по части slug доступен как '
+            '`?genre__icontains=`.'
+        )
+        assert self.get_names(client, category__icontains='film') == [
+            'Зомбилэнд', 'Терминатор'
+        ]
+
+    def test_02_slugs_resolved_once(self, client, admin_client,
+                                    django_assert_num_queries):
+        create_titles(admin_client)
+        # Жанры по slug, валидаторы условного GET, COUNT, страница,
+        # жанры страницы и фасеты.
+        with django_assert_num_queries(6):
+            response = client.get(
+                self.URL, {'genre': 'horror,drama', 'facets': 'year'}
+            )
+        assert response.json()['count'] == 2
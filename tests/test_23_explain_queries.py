@@ -0,0 +1,34 @@
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23ExplainQueries:
+
+    def test_01_viewset_queries_use_indexes(self, admin, capsys,
+                                            monkeypatch):
+        from api.management.commands.explain_queries import LIST_VARIANTS
+
+        call_command(
+            'generate_dataset', titles=50, users=30, reviews_per_title=5,
+            comments_per_review=1, seed=1
+        )
+        call_command('explain_queries')
+        assert 'no full scans' in capsys.readouterr().out
+
+        # Группировка по году читает всю таблицу произведений.
+        monkeypatch.setitem(LIST_VARIANTS, 'title', ('?facets=year',))
+        with pytest.raises(CommandError, match='scan a whole table'):
+            call_command('explain_queries')
+        assert 'full scan: SCAN reviews_title' in capsys.readouterr().err
+        call_command('explain_queries', allow=['reviews_title'])
+
+    def test_02_genre_title_is_unique(self):
+        from reviews.models import Genre, GenreTitle, Title
+
+        title = Title.objects.create(name='Произведение', year=2000)
+        genre = Genre.objects.create(name='Драма', slug='drama')
+        GenreTitle.objects.create(title=title, genre=genre)
+        with pytest.raises(IntegrityError):
+            GenreTitle.objects.create(title=title, genre=genre)
@@ -0,0 +1,60 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24Middleware:
+
+    def test_01_api_skips_site_middleware(self, client, admin_client):
+        response = client.get('/api/v1/categories/')
+        assert response.status_code == HTTPStatus.OK
+        assert 'X-Frame-Options' not in response, (
+            'Проверьте, что запросы к `/api/` не проходят через '
+            'XFrameOptionsMiddleware.'
+        )
+        assert 'Cookie' not in response.get('Vary', ''), (
+            'Проверьте, что запросы к `/api/` не проходят через '
+            'SessionMiddleware.'
+        )
+        assert not hasattr(response.wsgi_request, 'session')
+
+        response = admin_client.post(
+            '/api/v1/categories/', {'name': 'Фильмы', 'slug': 'films'}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+
+    def test_02_site_keeps_full_middleware(self, client, admin):
+        response = client.get('/redoc/')
+        assert response.status_code == HTTPStatus.OK
+        assert response['X-Frame-Options'] == 'DENY'
+
+        response = client.get('/admin/login/')
+        assert response.status_code == HTTPStatus.OK
+        assert 'csrftoken' in response.cookies
+        assert hasattr(response.wsgi_request, 'session')
+
+        client.force_login(admin)
+        admin.is_staff = True
+        admin.save()
+        response = client.get('/admin/')
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что админка работает с сессиями.'
+        )
+
+        client.handler.enforce_csrf_checks = True
+        response = client.post('/admin/logout/')
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что для админки работает CsrfViewMiddleware.'
+        )
+
+    def test_03_benchmark_full_middleware(self, tmp_path):
+        call_command(
+            'generate_dataset', titles=5, users=5, reviews_per_title=2,
+            comments_per_review=0, seed=1
+        )
+        call_command(
+            'benchmark', requests=2, warmup=0, full_middleware=True,
+            scenarios=['title-list']
+        )
@@ -0,0 +1,55 @@
+import json
+
+import pytest
+from django.core.management import call_command
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25SqliteTuning:
+
+    def test_01_pragmas(self, tmp_path):
+        from django.db import connection
+        from django.db.backends.sqlite3.base import DatabaseWrapper
+
+        with connection.cursor() as cursor:
+            for pragma, expected in (
+                ('busy_timeout', 5000),
+                ('cache_size', -64 * 1024),
+                ('synchronous', 1),
+            ):
+                cursor.execute(f'PRAGMA {pragma}')
+                assert cursor.fetchone()[0] == expected, (
+                    f'Проверьте, что к соединению применяется `{pragma}` '
+                    'из `SQLITE_PRAGMAS`.'
+                )
+
+        database = DatabaseWrapper(
+            {**connection.settings_dict, 'NAME': str(tmp_path / 'db.sqlite3')},
+            'default',
+        )
+        try:
+            with database.cursor() as cursor:
+                cursor.execute('PRAGMA journal_mode')
+                assert cursor.fetchone()[0] == 'wal', (
+                    'Проверьте, что файловая база открывается в режиме WAL.'
+                )
+        finally:
+            database.close()
+
+    def test_02_benchmark_concurrency(self, tmp_path):
+        call_command(
+            'generate_dataset', titles=10, users=10, reviews_per_title=2,
+            comments_per_review=0, seed=1
+        )
+        for no_tuning in (True, False):
+            output = tmp_path / f'{no_tuning}.json'
+            call_command(
+                'benchmark_concurrency', threads=2, duration=0.2,
+                write_share=0.5, no_tuning=no_tuning, output=str(output)
+            )
+            result = json.loads(output.read_text())
+            assert result['options']['no_tuning'] is no_tuning
+            assert set(result['results']) == {'read', 'write'}
+            for kind in result['results'].values():
+                assert kind['requests'] > 0
+                assert kind['p50_ms'] <= kind['p99_ms']
@@ -0,0 +1,111 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_titles
+
+
+@pytest.fixture
+def replicas(request, settings, tmp_path):
+    from django.db import connections
+
+    aliases = getattr(request, 'param', ['replica'])
+    for alias in aliases:
+        connections.databases[alias] = {
+            **connections.databases['default'],
+            'NAME': str(tmp_path / f'{alias}.sqlite3'),
+        }
+    settings.DATABASE_REPLICAS = aliases
+    yield aliases
+    for alias in aliases:
+        connections[alias].close()
+        del connections[alias]
+        del connections.databases[alias]
+
+
+def slugs(response):
+    return {item['slug'] for item in response.json()['results']}
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26ReadReplica:
+
+    def test_01_reads_go_to_replica(self, client, admin_client, user_client,
+                                    replicas):
+        from reviews.models import Category
+
+        titles, _, _ = create_titles(admin_client)
+        call_command('refresh_replicas')
+        Category.objects.create(name='Музыка', slug='music')
+
+        response = client.get('/api/v1/categories/')
+        assert response.status_code == HTTPStatus.OK
+        assert slugs(response) == {'films', 'books'}, (
+            'Проверьте, что чтение из вьюсетов идёт с реплики.'
+        )
+        assert 'music' in slugs(admin_client.get('/api/v1/categories/')), (
+            'Проверьте, что клиент после записи читает с основной базы.'
+        )
+
+        call_command('refresh_replicas')
+        assert 'music' in slugs(client.get('/api/v1/categories/')), (
+            'Проверьте, что `refresh_replicas` копирует основную базу в '
+            'реплику.'
+        )
+
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        response = user_client.post(url, {'text': 'Отзыв', 'score': 7})
+        assert response.status_code == HTTPStatus.CREATED
+        assert len(user_client.get(url).json()['results']) == 1, (
+            'Проверьте, что автор сразу видит свой отзыв.'
+        )
+        assert client.get(url).json()['results'] == []
+
+    def test_02_writes_and_migrations_use_primary(self, replicas):
+        from django.db import router
+
+        from core.replicas import replica_reads
+        from reviews.models import Title
+
+        token = replica_reads.set('replica')
+        try:
+            assert router.db_for_read(Title) == 'replica'
+            assert router.db_for_write(Title) == 'default'
+        finally:
+            replica_reads.reset(token)
+        assert router.db_for_read(Title) == 'default'
+        assert not router.allow_migrate('replica', 'reviews')
+        assert router.allow_migrate('default', 'reviews')
+
+    @pytest.mark.parametrize(
+        'replicas', [['replica_a', 'replica_b']], indirect=True
+    )
+    def test_03_one_replica_per_request(self, client, admin_client,
+                                        replicas, monkeypatch):
+        from django.core.cache import cache
+
+        from core import replicas as replica_module
+        from core.replicas import refresh_replicas
+        from reviews.models import Category
+
+        create_titles(admin_client)
+        refresh_replicas(['replica_a'])
+        Category.objects.create(name='Музыка', slug='music')
+        refresh_replicas(['replica_b'])
+
+        # Каждый вызов выбирает следующую реплику по кругу.
+        chosen = iter(replicas * 10)
+        monkeypatch.setattr(
+            replica_module.random, 'choice', lambda aliases: next(chosen)
+        )
+        seen = []
+        for _ in replicas:
+            cache.clear()
+            data = client.get('/api/v1/categories/').json()
+            assert data['count'] == len(data['results']), (
+                'Проверьте, что все запросы одного ответа читают одну и ту '
+                'же реплику.'
+            )
+            seen.append(data['count'])
+        assert seen == [2, 3]
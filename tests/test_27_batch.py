@@ -0,0 +1,145 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+URL = '/api/v1/batch/'
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27Batch:
+
+    def test_01_reads(self, admin_client, user_client, monkeypatch):
+        from core.authentication import CachedJWTAuthentication
+
+        titles, _, _ = create_titles(admin_client)
+        urls = (
+            f'/api/v1/titles/{titles[0]["id"]}/',
+            f'titles/{titles[0]["id"]}/reviews/',
+            'categories/?search=Фильмы',
+            'genres/',
+        )
+        expected = [
+            user_client.get(
+                url if url.startswith('/') else f'/api/v1/{url}'
+            ).json()
+            for url in urls
+        ]
+
+        authenticate = CachedJWTAuthentication.authenticate
+        calls = []
+
+        def counting_authenticate(self, request):
+            calls.append(request.path)
+            return authenticate(self, request)
+
+        monkeypatch.setattr(
+            CachedJWTAuthentication, 'authenticate', counting_authenticate
+        )
+        response = user_client.post(
+            URL,
+            {
+                'operations': [{'method': 'GET', 'url': url} for url in urls],
+                'parallel': True,
+            },
+            format='json',
+        )
+        assert response.status_code == HTTPStatus.OK
+        results = response.json()
+        assert [result['status'] for result in results] == [200] * 4
+        assert [result['body'] for result in results] == expected, (
+            f'Проверьте, что `{URL}` возвращает ответы операций в том же '
+            'порядке и в том же виде, что и отдельные запросы.'
+        )
+        assert calls == [URL], (
+            'Проверьте, что пакетный запрос аутентифицируется один раз.'
+        )
+
+    def test_02_writes_and_errors(self, client, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        reviews = f'titles/{titles[0]["id"]}/reviews/'
+        response = user_client.post(
+            URL,
+            {
+                'operations': [
+                    {
+                        'method': 'POST',
+                        'url': reviews,
+                        'body': {'text': 'Отзыв', 'score': 8},
+                    },
+                    {'method': 'GET', 'url': reviews},
+                    {'method': 'GET', 'url': 'titles/0/'},
+                    {'method': 'GET', 'url': '/api/v1/auth/signup/'},
+                    {'method': 'DELETE', 'url': 'categories/films/'},
+                ]
+            },
+            format='json',
+        )
+        assert response.status_code == HTTPStatus.OK
+        results = response.json()
+        assert [result['status'] for result in results] == [
+            201, 200, 404, 404, 403
+        ]
+        assert results[0]['body']['author'] == 'TestUser'
+        assert results[1]['body']['count'] == 1, (
+            'Проверьте, что операции пакета видят записи предыдущих '
+            'операций.'
+        )
+
+        response = client.post(
+            URL,
+            {'operations': [{'method': 'POST', 'url': reviews, 'body': {}}]},
+            content_type='application/json',
+        )
+        assert response.json()[0]['status'] == HTTPStatus.UNAUTHORIZED
+
+        for data in (
+            {'operations': []},
+            {'operations': [{'method': 'PUT', 'url': reviews}]},
+            {'operations': [{'method': 'GET', 'url': reviews}] * 21},
+        ):
+            response = user_client.post(URL, data, format='json')
+            assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_03_atomic(self, admin_client):
+        from reviews.models import Category
+
+        operations = [
+            {
+                'method': 'POST',
+                'url': 'categories/',
+                'body': {'name': 'Музыка', 'slug': 'music'},
+            },
+            {'method': 'GET', 'url': 'categories/'},
+            {
+                'method': 'POST',
+                'url': 'categories/',
+                'body': {'name': 'Музыка', 'slug': 'music'},
+            },
+            {'method': 'GET', 'url': 'categories/'},
+        ]
+        response = admin_client.post(
+            URL, {'operations': operations, 'atomic': True}, format='json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        results = response.json()
+        assert [result['status'] for result in results] == [
+            201, 200, 400, 424
+        ]
+        assert results[1]['body']['count'] == 1
+        assert not Category.objects.exists(), (
+            'Проверьте, что при ошибке в атомарном пакете все его записи '
+            'откатываются.'
+        )
+        response = admin_client.get('/api/v1/categories/')
+        assert response.json()['count'] == 0
+
+        response = admin_client.post(
+            URL, {'operations': operations}, format='json'
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert [result['status'] for result in response.json()] == [
+            201, 200, 400, 200
+        ]
+        assert Category.objects.count() == 1
@@ -0,0 +1,102 @@
+import json
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28SparseFields:
+
+    def test_01_title_fields(self, client, admin_client):
+        create_titles(admin_client)
+        url = '/api/v1/titles/'
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, {'fields': 'id,name,rating'})
+        assert response.status_code == HTTPStatus.OK
+        assert [
+            set(item) for item in response.json()['results']
+        ] == [{'id', 'name', 'rating'}] * 2, (
+            f'Проверьте, что `{url}?fields=` оставляет только перечисленные '
+            'поля.'
+        )
+        sql = ' '.join(query['sql'] for query in context.captured_queries)
+        for part in ('"description"', 'reviews_genre', 'reviews_category'):
+            assert part not in sql, (
+                'Проверьте, что поля, которые не запрошены, не загружаются '
+                'из базы данных.'
+            )
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, {'exclude': 'description,genre'})
+        assert set(response.json()['results'][0]) == {
+            'id', 'name', 'year', 'rating', 'category'
+        }
+        assert response.json()['results'][0]['category']['slug']
+        sql = ' '.join(query['sql'] for query in context.captured_queries)
+        assert 'reviews_genre' not in sql
+        assert '"description"' not in sql
+
+        title_id = response.json()['results'][0]['id']
+        response = client.get(f'{url}{title_id}/', {'fields': 'genre'})
+        assert set(response.json()) == {'genre'}
+        assert response.json()['genre']
+
+    def test_02_errors_and_writes(self, client, admin_client):
+        create_titles(admin_client)
+        response = client.get('/api/v1/titles/', {'fields': 'id,secret'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert 'fields' in response.json()
+        response = client.get('/api/v1/genres/', {'exclude': 'id'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert 'exclude' in response.json()
+
+        response = admin_client.post(
+            '/api/v1/categories/?fields=slug',
+            {'name': 'Музыка', 'slug': 'music'},
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json() == {'name': 'Музыка', 'slug': 'music'}, (
+            'Проверьте, что `fields` не влияет на запросы на запись.'
+        )
+        response = client.get('/api/v1/categories/', {'fields': 'slug'})
+        assert response.json()['results'][0] == {'slug': 'books'}
+
+    def test_03_review_fields(self, client, admin_client, admin):
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(admin_client, titles[0]['id'], 'Отзыв', 5)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        for query in ({'fields': 'id,score'}, {'fields': 'id,score',
+                                               'cursor': ''}):
+            with CaptureQueriesContext(connection) as context:
+                response = client.get(url, query)
+            assert response.status_code == HTTPStatus.OK
+            assert response.json()['results'] == [
+                {'id': response.json()['results'][0]['id'], 'score': 5}
+            ]
+            sql = ' '.join(query['sql'] for query in context.captured_queries)
+            assert 'users_user' not in sql
+            assert '"text"' not in sql
+
+    def test_04_benchmark_serializers(self, tmp_path):
+        call_command(
+            'generate_dataset', titles=20, users=10, reviews_per_title=5,
+            comments_per_review=0, seed=1
+        )
+        output = tmp_path / 'result.json'
+        call_command('benchmark_serializers', repeat=2, output=str(output))
+        results = json.loads(output.read_text())['results']
+        assert results['title?']['rows'] == 20
+        assert (
+            results['title?fields=id,name,rating']['bytes']
+            < results['title?']['bytes']
+        )
+        assert (
+            results['review?exclude=text']['bytes']
+            < results['review?']['bytes']
+        )
@@ -0,0 +1,104 @@
+import io
+import uuid
+from collections import OrderedDict
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from http import HTTPStatus
+
+import pytest
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ErrorDetail, ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnDict, ReturnList
+
+from tests.utils import create_single_review, create_titles
+
+PAYLOAD = ReturnList(
+    [
+        ReturnDict(
+            OrderedDict(
+                id=1,
+                name='Терминатор\u2028\u2029"\\',
+                rating=5.5,
+                score=Decimal('7.25'),
+                updated=datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+                year=date(1984, 10, 26),
+                label=gettext_lazy('Фильмы'),
+                detail=ErrorDetail('Ошибка', code='invalid'),
+                uuid=uuid.UUID(int=1),
+                genres=('horror', 'comedy'),
+                facets={1984: 1, 'books': 2},
+                empty=None,
+                flag=True,
+            ),
+            serializer=None,
+        ),
+        {'big': 2 ** 70},
+    ],
+    serializer=None,
+)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test29JsonCodec:
+
+    @pytest.mark.parametrize('orjson_installed', (True, False))
+    def test_01_renderer_matches_drf(self, orjson_installed, monkeypatch):
+        from core import renderers
+
+        if not orjson_installed:
+            monkeypatch.setattr(renderers, 'orjson', None)
+        renderer = renderers.FastJSONRenderer()
+        expected = JSONRenderer().render(PAYLOAD)
+        assert renderer.render(PAYLOAD) == expected, (
+            'Проверьте, что FastJSONRenderer выдаёт тот же JSON, что и '
+            'JSONRenderer.'
+        )
+        assert renderer.render(PAYLOAD[0]) == JSONRenderer().render(
+            PAYLOAD[0]
+        )
+        assert renderer.render(None) == b''
+        indented = 'application/json; indent=4'
+        assert renderer.render(PAYLOAD, indented) == JSONRenderer().render(
+            PAYLOAD, indented
+        )
+        assert renderer.encode == renderers.FastJSONRenderer().encode, (
+            'Проверьте, что рендереры используют один общий JSON-кодировщик.'
+        )
+        if not orjson_installed:
+            with pytest.raises(ValueError):
+                renderer.render({'rating': float('nan')})
+
+    def test_02_parser(self):
+        from core.parsers import FastJSONParser
+
+        content = '{"name": "Терминатор", "genre": ["horror"], "year": 1984}'
+        parsed = FastJSONParser().parse(io.BytesIO(content.encode()))
+        assert parsed == JSONParser().parse(io.BytesIO(content.encode()))
+        for content in (b'{"name": ', b'{"rating": NaN}'):
+            with pytest.raises(ParseError):
+                FastJSONParser().parse(io.BytesIO(content))
+
+    def test_03_api_responses(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        response = create_single_review(
+            admin_client, titles[0]['id'], 'Отзыв', 5
+        )
+        for url in (
+            '/api/v1/titles/',
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/',
+        ):
+            response = admin_client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            assert response.content == JSONRenderer().render(response.data)
+
+        response = admin_client.post(
+            '/api/v1/genres/', '{"name": "Ужасы", "slug": "horror-2"}',
+            content_type='application/json',
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        response = admin_client.post(
+            '/api/v1/genres/', '{"name": ', content_type='application/json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST